@@ -5,6 +5,8 @@ import json
 from pathlib import Path
 from typing import Set
 
+from utils.file_utils import HASH_ALGORITHMS
+
 class Config:
     """Application configuration manager."""
     
@@ -14,6 +16,7 @@ class Config:
             'language': 'en',
             'default_hash_algo': 'md5',
             'auto_load_indices': True,
+            'search_as_you_type': False,
             'index_search_locations': [
                 str(Path.cwd()),
                 str(Path.home()),
@@ -24,6 +27,7 @@ class Config:
             'active_indices': []
         }
         self.config = self.load_config()
+        self._dirty = False  # Set by any change, cleared once written to disk
     
     def load_config(self) -> dict:
         """Load configuration from file."""
@@ -34,16 +38,22 @@ class Config:
                     # Merge with defaults
                     config = self.default_config.copy()
                     config.update(loaded)
+                    # A saved algorithm whose optional package is no longer installed
+                    if config.get('default_hash_algo') not in HASH_ALGORITHMS:
+                        config['default_hash_algo'] = self.default_config['default_hash_algo']
                     return config
             except Exception:
                 pass
         return self.default_config.copy()
     
     def save_config(self):
-        """Save configuration to file."""
+        """Save configuration to file, skipping the write if nothing changed."""
+        if not self._dirty:
+            return
         try:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
+            self._dirty = False
         except Exception:
             pass
     
@@ -53,7 +63,10 @@ class Config:
     
     def set(self, key: str, value):
         """Set configuration value."""
+        if key in self.config and self.config[key] == value:
+            return
         self.config[key] = value
+        self._dirty = True
 
     def get_active_indices(self) -> Set[str]:
         """Get set of active index file paths."""
@@ -62,11 +75,14 @@ class Config:
     def set_index_active(self, index_path: str, active: bool):
         """Set active state for an index."""
         active_indices = set(self.config.get('active_indices', []))
+        if (index_path in active_indices) == active:
+            return
         if active:
             active_indices.add(index_path)
         else:
             active_indices.discard(index_path)
         self.config['active_indices'] = list(active_indices)
+        self._dirty = True
 
     def is_index_active(self, index_path: str) -> bool:
         """Check if index is active (default True for new indices)."""
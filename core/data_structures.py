@@ -1,6 +1,6 @@
 """Core data structures for the Universal Search Tool."""
 from pathlib import Path
-from typing import List, Optional, NamedTuple
+from typing import Callable, List, Optional, NamedTuple
 from datetime import datetime as dt
 
 class FileEntry(NamedTuple):
@@ -14,6 +14,9 @@ class DuplicateMatch(NamedTuple):
     """Represents a source file and a list of its found duplicates."""
     source_file: Path
     destinations: List[FileEntry]
+    # Source size/mtime as seen when the match was found, so reports need not re-stat
+    source_size: Optional[int] = None
+    source_mtime: Optional[float] = None
 
 class SearchCriteria(NamedTuple):
     """Holds the criteria for searching within file indexes."""
@@ -22,6 +25,17 @@ class SearchCriteria(NamedTuple):
     size_max: Optional[int] = None
     date_min: Optional[dt] = None
     date_max: Optional[dt] = None
+    # Pre-compiled name_pattern (bound ``re.Pattern.search``), built once per search
+    name_matcher: Optional[Callable] = None
+
+class SearchBounds(NamedTuple):
+    """SearchCriteria normalized for the inner loop: numeric ranges with
+    +/-inf in place of None, and the compiled name matcher (or None)."""
+    size_min: float
+    size_max: float
+    mtime_min: float
+    mtime_max: float
+    name_match: Optional[Callable]
 
 class SearchResult(NamedTuple):
     """A single file search result"""
@@ -47,3 +61,7 @@ class ScanConfig(NamedTuple):
     hash_algo: str
     reuse_indices: bool
     recreate_indices: bool
+    # Hash mode: accept a single same-name, same-size candidate without hashing
+    skip_hash_when_unambiguous: bool = False
+    # Name + size mode: confirm each match with a byte-for-byte comparison
+    verify_contents: bool = False
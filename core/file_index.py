@@ -2,16 +2,55 @@
 
 """File indexing and CAF format handling."""
 import os
+import re
+import sys
+import copy
 import time
+import hashlib
+import pickle
 import struct
+import tempfile
+import threading
 from pathlib import Path, PureWindowsPath, PurePosixPath
-from collections import defaultdict
-from typing import Dict, List, Optional, Tuple
+from collections import defaultdict, OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
 import stat
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime as dt
 
 from core.data_structures import FileEntry, DuplicateMatch
-from utils.file_utils import calculate_file_hash, path_is_native_and_exists, format_size
+from utils.file_utils import (calculate_file_hash, path_is_native_and_exists, format_size,
+                              quick_fingerprint, files_equal, FINGERPRINT_WINDOW)
+
+# File size/mtime ranges are appended to the CAF comment so a search can skip
+# an index without reading its entries; Cathy just shows it as comment text.
+_RANGES_RE = re.compile(r'\[size: (\d+)-(\d+); mtime: (\d+)-(\d+)\]')
+
+def stat_and_hash_file(path_str: str, use_hash: bool, hash_algo: str) -> Optional[Tuple[str, int, int, str]]:
+    """
+    Stat and optionally hash a single file. Module-level so it can be pickled
+    for a process pool. Returns (path_str, size, mtime, hash) or None when
+    the file should be skipped, mirroring FileIndex.add_file.
+    """
+    try:
+        stat_info = os.stat(path_str)
+        if not stat.S_ISREG(stat_info.st_mode):  # Skip non-regular files
+            return None
+        
+        file_hash = ""
+        if use_hash:
+            file_hash = calculate_file_hash(Path(path_str), hash_algo)
+            if not file_hash:
+                return None  # Skip files that couldn't be read
+        
+        return path_str, stat_info.st_size, int(stat_info.st_mtime), file_hash
+    except OSError:
+        return None
+
+# Source files checked per round in find_all_duplicates_bulk; bounds the work left after a cancel
+DUPLICATE_CHECK_BATCH = 256
 
 class FileIndex:
     """
@@ -33,11 +72,20 @@ class FileIndex:
         self.size_index: Dict[int, List[FileEntry]] = defaultdict(list)
         self.hash_index: Dict[Tuple[int, str], List[FileEntry]] = defaultdict(list)
         self.total_files = 0
+        # Sorted size_index keys for range queries; rebuilt when sizes are added
+        self._sorted_sizes: Optional[List[int]] = None
 
     def add_file(self, file_path: Path) -> bool:
         """Adds a file to the in-memory index."""
         try:
             stat_info = file_path.stat()
+        except OSError:
+            return False
+        return self.add_file_with_stat(file_path, stat_info)
+
+    def add_file_with_stat(self, file_path: Path, stat_info: os.stat_result) -> bool:
+        """Like add_file, but with stat info the caller already has (e.g. from os.DirEntry)."""
+        try:
             if not stat.S_ISREG(stat_info.st_mode):  # Skip non-regular files
                 return False
             
@@ -60,16 +108,75 @@ class FileIndex:
             return True
         except OSError:
             return False
+
+    def sizes_in_range(self, size_min: Optional[int] = None, size_max: Optional[int] = None) -> List[int]:
+        """
+        Return the size buckets within [size_min, size_max] (None = open end)
+        by bisecting the sorted bucket sizes, instead of testing every bucket.
+        Buckets are never removed, so the sorted list is stale only when the
+        number of buckets has changed.
+        """
+        sizes = self._sorted_sizes
+        if sizes is None or len(sizes) != len(self.size_index):
+            sizes = self._sorted_sizes = sorted(self.size_index)
+        lo = bisect_left(sizes, size_min) if size_min is not None else 0
+        hi = bisect_right(sizes, size_max) if size_max is not None else len(sizes)
+        return sizes[lo:hi]
+
+    def iter_entries(self) -> Iterator[FileEntry]:
+        """Iterate over every entry in the index, without building a flat list."""
+        return chain.from_iterable(self.size_index.values())
+
+    def add_raw_entry(self, raw: Tuple[str, int, int, str]):
+        """Add a pre-computed (path_str, size, mtime, hash) tuple from stat_and_hash_file without re-stat/re-hash."""
+        path_str, file_size, mtime, file_hash = raw
+        entry = FileEntry(Path(path_str), file_size, mtime, file_hash)
+        self.size_index[file_size].append(entry)
         
+        if self.use_hash:
+            self.hash_index[(file_size, file_hash)].append(entry)
+        
+        self.total_files += 1
+
+    @classmethod
+    def load_from_caf_cached(cls, caf_path: Path, use_hash: bool, hash_algo: str) -> Optional['FileIndex']:
+        """
+        Like load_from_caf, but reuses the parsed index while the file is
+        unchanged (same path, mtime and size): in memory within a process, for
+        the PARSED_INDEX_MEMORY_ENTRIES most recently used files, and across
+        runs through a pickle in PARSED_INDEX_CACHE_DIR. Parsing
+        does not depend on the hash settings, so search, duplicate scans and
+        the browser all share one parse per file. The returned index shares
+        its lookup tables between callers and must not be modified.
+        """
+        try:
+            stat_info = caf_path.stat()
+        except OSError:
+            print(f"[CAF] File not found: {caf_path}", file=sys.stderr)
+            return None
+        index = _load_from_caf_cached(str(caf_path), stat_info.st_mtime_ns, stat_info.st_size)
+        if index is not None and (index.use_hash, index.hash_algo) != (use_hash, hash_algo):
+            # Shallow copy: same size/hash tables, caller's hash settings
+            index = copy.copy(index)
+            index.use_hash = use_hash
+            index.hash_algo = hash_algo
+        return index
+
+    @staticmethod
+    def clear_load_cache():
+        """Drop all indices cached by load_from_caf_cached."""
+        with _parsed_indexes_lock:
+            _parsed_indexes.clear()
+
     @classmethod
     def load_from_caf(cls, caf_path: Path, use_hash: bool, hash_algo: str) -> Optional['FileIndex']:
         """
         Loads an index from a .caf file with proper CAF format handling.
         """
-        print(f"[CAF] Loading CAF file: {caf_path}")
+        print(f"[CAF] Loading CAF file: {caf_path}", file=sys.stderr)
         
         if not caf_path.is_file(): 
-            print(f"[CAF] File not found: {caf_path}")
+            print(f"[CAF] File not found: {caf_path}", file=sys.stderr)
             return None
         
         with caf_path.open('rb') as buffer:
@@ -77,22 +184,22 @@ class FileIndex:
                 # Header validation
                 magic = struct.unpack('<L', buffer.read(4))[0]
                 if not (magic > 0 and magic % cls.ulModus == cls.ulMagicBase): 
-                    print(f"[CAF] Invalid magic number: {magic}")
+                    print(f"[CAF] Invalid magic number: {magic}", file=sys.stderr)
                     return None
                 version = int(magic / cls.ulModus)
                 if version > 2: 
                     version = struct.unpack('<h', buffer.read(2))[0]
                 if version > cls.saveVersion: 
-                    print(f"[CAF] Unsupported version: {version}")
+                    print(f"[CAF] Unsupported version: {version}", file=sys.stderr)
                     return None
 
-                print(f"[CAF] CAF version: {version}")
+                print(f"[CAF] CAF version: {version}", file=sys.stderr)
 
                 # Header parsing
                 buffer.read(4) # Skip date
                 device = cls._read_string(buffer) if version >= 2 else ""
                 
-                print(f"[CAF] Device path: {device}")
+                print(f"[CAF] Device path: {device}", file=sys.stderr)
                 
                 # Platform-independent path handling
                 is_windows_path = '\\' in device or (len(device) > 1 and device[1] == ':')
@@ -108,7 +215,7 @@ class FileIndex:
 
                 # Parse info block to get directory information
                 dir_count = struct.unpack('<l', buffer.read(4))[0]
-                print(f"[CAF] Directory count: {dir_count}")
+                print(f"[CAF] Directory count: {dir_count}", file=sys.stderr)
                 
                 # Read directory info to understand file counts per directory
                 dir_info = []
@@ -124,41 +231,36 @@ class FileIndex:
 
                 # Read element data
                 file_count = struct.unpack('<l', buffer.read(4))[0]
-                print(f"[CAF] Total elements (files + dirs): {file_count}")
+                print(f"[CAF] Total elements (files + dirs): {file_count}", file=sys.stderr)
                 
+                # Element block: read it in one go and parse from memory rather
+                # than issuing several small reads (and one per name byte) per element.
+                # Size is 4 bytes signed up to v6, 8 bytes after; parent ID is
+                # 2 bytes unsigned up to v7, 4 bytes in v8
+                elm_head = struct.Struct('<L' + ('l' if version <= 6 else 'q') + ('L' if version > 7 else 'H'))
+                data = buffer.read()
+                pos = 0
                 raw_elm = []
                 for _ in range(file_count):
-                    mtime = struct.unpack('<L', buffer.read(4))[0]
-                    
-                    # Handle different size formats by version
-                    if version <= 6:
-                        # v6 uses a 4-byte signed integer for size/directory_id
-                        size = struct.unpack('<l', buffer.read(4))[0]
+                    mtime, size, parent_id = elm_head.unpack_from(data, pos)
+                    pos += elm_head.size
+                    end = data.find(b'\x00', pos)
+                    if end < 0:
+                        end = len(data)
+                    raw_elm.append((mtime, size, parent_id, data[pos:end].decode('latin-1', errors='replace')))
+                    pos = end + 1
 
-                    else:
-                        # v7/v8 use an 8-byte signed integer
-                        size = struct.unpack('<q', buffer.read(8))[0]
-                    
-                    # Handle parent ID format by version  
-                    if version > 7:
-                        parent_id = struct.unpack('<L', buffer.read(4))[0]
-                    else:
-                        parent_id = struct.unpack('<H', buffer.read(2))[0]
-                    
-                    filename = cls._read_string(buffer)
-                    raw_elm.append((mtime, size, parent_id, filename))
-
-                print(f"[CAF] Read {len(raw_elm)} elements from CAF")
+                print(f"[CAF] Read {len(raw_elm)} elements from CAF", file=sys.stderr)
 
-                print("[CAF] Pre-calculating parent directory IDs for legacy CAF...")
+                print("[CAF] Pre-calculating parent directory IDs for legacy CAF...", file=sys.stderr)
                 referenced_parent_ids = {parent_id for _, _, parent_id, _ in raw_elm}
-                print(f"[CAF] Found {len(referenced_parent_ids)} unique directories")
+                print(f"[CAF] Found {len(referenced_parent_ids)} unique directories", file=sys.stderr)
 
                 # Build directory structure properly
                 dir_path_map = {0: index.root_path}
                 
                 if version <= 6:
-                    print(f"[CAF] Processing legacy CAF v{version} with optimized algorithm")
+                    print(f"[CAF] Processing legacy CAF v{version} with optimized algorithm", file=sys.stderr)
                     
                     # First, build the directory tree.
                     # We loop until no new directories can be added in a full pass.
@@ -177,7 +279,7 @@ class FileIndex:
                         if dirs_created_this_pass == 0:
                             break # Exit loop when the tree is fully built
 
-                    print(f"[CAF] Created {len(dir_path_map) - 1} directory paths for legacy CAF")
+                    print(f"[CAF] Created {len(dir_path_map) - 1} directory paths for legacy CAF", file=sys.stderr)
                     
                     # Now, add the files in a separate loop.
                     files_added = 0
@@ -193,7 +295,7 @@ class FileIndex:
                                 files_added += 1
                     
                     index.total_files = files_added
-                    print(f"[CAF] Added {files_added} files to index")
+                    print(f"[CAF] Added {files_added} files to index", file=sys.stderr)
 
 
                 else:
@@ -206,7 +308,7 @@ class FileIndex:
                                 dir_path_map[dir_id] = dir_path_map[parent_id] / name
                                 dirs_created += 1
                     
-                    print(f"[CAF] Created {dirs_created} directory paths for modern CAF")
+                    print(f"[CAF] Created {dirs_created} directory paths for modern CAF", file=sys.stderr)
 
                 # Add files to index
                 files_added = 0
@@ -243,20 +345,20 @@ class FileIndex:
                         
                         # Log first few files for debugging
                         if files_added <= 5:
-                            print(f"[CAF] File {files_added}: {name} in {dir_path_map.get(file_parent_id, 'UNKNOWN')} ({actual_size} bytes)")
+                            print(f"[CAF] File {files_added}: {name} in {dir_path_map.get(file_parent_id, 'UNKNOWN')} ({actual_size} bytes)", file=sys.stderr)
 
-                print(f"[CAF] Added {files_added} files to index")
-                print(f"[CAF] Created {size_buckets_created} size buckets")
-                print(f"[CAF] Final total_files: {index.total_files}")
+                print(f"[CAF] Added {files_added} files to index", file=sys.stderr)
+                print(f"[CAF] Created {size_buckets_created} size buckets", file=sys.stderr)
+                print(f"[CAF] Final total_files: {index.total_files}", file=sys.stderr)
                 
                 # Verify the index has content
                 if index.total_files == 0:
-                    print(f"[CAF] WARNING: No files were indexed from {caf_path}")
+                    print(f"[CAF] WARNING: No files were indexed from {caf_path}", file=sys.stderr)
                 
                 return index
                 
             except Exception as e:
-                print(f"[CAF] Error loading CAF file {caf_path}: {e}")
+                print(f"[CAF] Error loading CAF file {caf_path}: {e}", file=sys.stderr)
                 import traceback
                 traceback.print_exc()
                 return None
@@ -364,20 +466,27 @@ class FileIndex:
                     file_count = struct.unpack('<l', buffer.read(4))[0]
                     total_size = int(struct.unpack('<d', buffer.read(8))[0])
                 
-                return {
+                meta = {
                     'device': device,
                     'volume': volume,
+                    'comment': comment,
                     'file_count': file_count,
                     'total_size': total_size,
                     'created_date': dt.fromtimestamp(created_timestamp),
                     'archive': archive,
                     'freesize': freesize
                 }
+                ranges = _RANGES_RE.search(comment)
+                if ranges:
+                    meta['min_size'], meta['max_size'], meta['min_mtime'], meta['max_mtime'] = map(int, ranges.groups())
+                return meta
                 
             except (struct.error, OSError, IndexError):
                 return None
             
-    def find_potential_duplicates_optimized(self, file_path: Path) -> List[FileEntry]:
+    def find_potential_duplicates_optimized(self, file_path: Path,
+                                            skip_hash_when_unambiguous: bool = False,
+                                            verify_contents: bool = False) -> List[FileEntry]:
         """
         Optimized duplicate detection that only calculates hashes when needed.
         Much faster than building full hash index during CAF load.
@@ -389,11 +498,17 @@ class FileIndex:
             return []
         
         if self.use_hash:
-            return self._find_hash_duplicates_optimized(file_path, file_size)
+            return self._find_hash_duplicates_optimized(file_path, file_size, skip_hash_when_unambiguous)
         else:
-            return self._find_name_duplicates_optimized(file_path, file_size)
+            matches = self._find_name_duplicates_optimized(file_path, file_size)
+            if verify_contents:
+                # Unverifiable candidates (not on this system) are not matches
+                matches = [m for m in matches
+                           if path_is_native_and_exists(m.path) and files_equal(file_path, Path(m.path))]
+            return matches
    
-    def _find_hash_duplicates_optimized(self, file_path: Path, file_size: int) -> List[FileEntry]:
+    def _find_hash_duplicates_optimized(self, file_path: Path, file_size: int,
+                                        skip_hash_when_unambiguous: bool = False) -> List[FileEntry]:
         """Hash-based duplicate detection with on-demand hash calculation."""
         
         # Step 1: Quick size pre-filtering (this part is correct)
@@ -411,21 +526,45 @@ class FileIndex:
         if not size_candidates:
             return []
         
-        # Step 2: Calculate hash for the source file only once
+        # If the file doesn't exist locally, we can't verify its hash, so it's NOT a match.
+        size_candidates = [c for c in size_candidates if path_is_native_and_exists(c[0])]
+        
+        # Trust a (size, name) pair that identifies exactly one candidate, as long as
+        # the file on disk still has the indexed size and mtime; otherwise hash it
+        if skip_hash_when_unambiguous:
+            same_name = [c for c in size_candidates if c[0].name == file_path.name]
+            if len(same_name) == 1:
+                candidate_path, mtime, size = same_name[0]
+                try:
+                    stat_info = os.stat(candidate_path)
+                except OSError:
+                    stat_info = None
+                if stat_info and stat_info.st_size == size and int(stat_info.st_mtime) == mtime:
+                    return [FileEntry(candidate_path, size, mtime, "")]
+        
+        # Step 2: For files larger than the two fingerprint windows, drop candidates
+        # whose head/tail fingerprint differs before paying for a full hash
+        if size_candidates and file_size > 2 * FINGERPRINT_WINDOW:
+            source_fp = quick_fingerprint(file_path, file_size)
+            if source_fp is None:
+                return []
+            size_candidates = [c for c in size_candidates
+                               if quick_fingerprint(Path(c[0]), file_size) == source_fp]
+        
+        if not size_candidates:
+            return []
+        
+        # Step 3: Calculate hash for the source file only once
         source_hash = calculate_file_hash(file_path, self.hash_algo)
         if not source_hash:
             return []
         
-        # Step 3: Calculate hashes ONLY for candidates that exist locally
+        # Step 4: Calculate full hashes only for the remaining candidates
         matches = []
         for candidate_path, mtime, size in size_candidates:
-            # FIX: Only proceed if the file exists on the current system
-            if path_is_native_and_exists(candidate_path):
-                # Calculate hash only for existing, size-matched files
-                candidate_hash = calculate_file_hash(Path(candidate_path), self.hash_algo)
-                if candidate_hash and candidate_hash == source_hash:
-                    matches.append(FileEntry(candidate_path, size, mtime, candidate_hash))
-            # If the file doesn't exist locally, we can't verify its hash, so it's NOT a match.
+            candidate_hash = calculate_file_hash(Path(candidate_path), self.hash_algo)
+            if candidate_hash and candidate_hash == source_hash:
+                matches.append(FileEntry(candidate_path, size, mtime, candidate_hash))
             
         return matches
 
@@ -467,7 +606,9 @@ class FileIndex:
     
     @staticmethod
     def find_all_duplicates_bulk(source_index: 'FileIndex', dest_index: 'FileIndex', 
-                        progress_callback=None, cancel_event=None) -> List[DuplicateMatch]:
+                        progress_callback=None, cancel_event=None,
+                        skip_hash_when_unambiguous: bool = False,
+                        verify_contents: bool = False) -> List[DuplicateMatch]:
         """
         Bulk duplicate detection optimized for scanning operations.
         Processes files in batches and calculates hashes strategically.
@@ -476,7 +617,7 @@ class FileIndex:
         
         duplicates = []
         
-        # Get source files, grouped by size for efficiency
+        # Get (source file, mtime) pairs, grouped by size for efficiency
         source_files_by_size = defaultdict(list)
         
         if hasattr(source_index, 'raw_elm'):
@@ -485,61 +626,87 @@ class FileIndex:
                 if size >= 0 and parent_id in dir_map:  # Regular file
                     file_path = dir_map[parent_id] / filename
                     if path_is_native_and_exists(file_path):
-                        source_files_by_size[size].append(Path(file_path))
+                        source_files_by_size[size].append((Path(file_path), mtime))
         else:
-            # Fall back to traditional approach
-            for file_path in source_index.root_path.rglob('*'):
-                if file_path.is_file():
-                    try:
-                        size = file_path.stat().st_size
-                        source_files_by_size[size].append(file_path)
-                    except OSError:
-                        continue
+            # Reuse the source index's entries instead of walking the tree
+            # again. A size missing from the destination can't have a
+            # duplicate, so those files are dropped here without any hashing
+            # or per-file lookup
+            dest_sizes = dest_index.size_index
+            for size, entries in source_index.size_index.items():
+                if size in dest_sizes:
+                    source_files_by_size[size].extend((entry.path, entry.mtime) for entry in entries)
         
         total_files = sum(len(files) for files in source_files_by_size.values())
         processed = 0
         
+        def check(source_file):
+            matches = dest_index.find_potential_duplicates_optimized(source_file, skip_hash_when_unambiguous,
+                                                                     verify_contents)
+            if not matches:
+                return matches, None
+            # Indexed mtimes are whole seconds; reports show a match's source mtime in full
+            try:
+                return matches, source_file.stat().st_mtime
+            except OSError:
+                return matches, None
+        
+        # Hashing and content checks read whole files, and hashlib releases the GIL,
+        # so source files are checked several at a time; name matching stays serial
+        executor = None
+        map_files = map
+        if dest_index.use_hash or verify_contents:
+            executor = ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1))
+            map_files = executor.map
+        
         # Process each size group
-        for size, source_files in source_files_by_size.items():
-            if cancel_event and cancel_event.is_set():
-                break
-                
-            if progress_callback:
-                progress_callback("Finding duplicates", f"Processing {len(source_files)} files of size {format_size(size)}")
-            
-            # Find potential destination matches by size first
-            dest_candidates = []
-            if hasattr(dest_index, 'raw_elm'):
-                dest_dir_map = dest_index._get_or_build_dir_map()
-                for mtime, dest_size, parent_id, filename in dest_index.raw_elm:
-                    if dest_size == size and dest_size >= 0 and parent_id in dest_dir_map:
-                        dest_path = dest_dir_map[parent_id] / filename
-                        dest_candidates.append((dest_path, mtime, dest_size))
-            else:
-                dest_candidates = [(entry.path, entry.mtime, entry.size) for entry in dest_index.size_index.get(size, [])]
-            
-            if not dest_candidates:
-                processed += len(source_files)
-                continue
-            
-            # Now process source files of this size
-            for source_file in source_files:
+        try:
+            for size, source_files in source_files_by_size.items():
                 if cancel_event and cancel_event.is_set():
                     break
                     
-                processed += 1
-                if progress_callback and processed % 50 == 0:
-                    progress_callback("Finding duplicates", f"Checked {processed}/{total_files} files ({len(duplicates)} duplicates found)")
+                if progress_callback:
+                    progress_callback("Finding duplicates", f"Processing {len(source_files)} files of size {format_size(size)}")
                 
-                # Use optimized duplicate detection
-                matches = dest_index.find_potential_duplicates_optimized(source_file)
+                # Find potential destination matches by size first
+                dest_candidates = []
+                if hasattr(dest_index, 'raw_elm'):
+                    dest_dir_map = dest_index._get_or_build_dir_map()
+                    for mtime, dest_size, parent_id, filename in dest_index.raw_elm:
+                        if dest_size == size and dest_size >= 0 and parent_id in dest_dir_map:
+                            dest_path = dest_dir_map[parent_id] / filename
+                            dest_candidates.append((dest_path, mtime, dest_size))
+                else:
+                    dest_candidates = [(entry.path, entry.mtime, entry.size) for entry in dest_index.size_index.get(size, [])]
                 
-                if matches:
-                    duplicates.append(DuplicateMatch(
-                        source_file=source_file,
-                        destinations=matches
-                    ))
-        
+                if not dest_candidates:
+                    processed += len(source_files)
+                    continue
+                
+                # Now process source files of this size, a batch at a time so a
+                # cancel is noticed between batches
+                for start in range(0, len(source_files), DUPLICATE_CHECK_BATCH):
+                    if cancel_event and cancel_event.is_set():
+                        break
+                    batch = source_files[start:start + DUPLICATE_CHECK_BATCH]
+                    
+                    # Use optimized duplicate detection
+                    results = map_files(check, (source_file for source_file, _ in batch))
+                    for (source_file, source_mtime), (matches, exact_mtime) in zip(batch, results):
+                        if matches:
+                            duplicates.append(DuplicateMatch(
+                                source_file=source_file,
+                                destinations=matches,
+                                source_size=size,
+                                source_mtime=source_mtime if exact_mtime is None else exact_mtime
+                            ))
+                    
+                    processed += len(batch)
+                    if progress_callback:
+                        progress_callback("Finding duplicates", f"Checked {processed}/{total_files} files ({len(duplicates)} duplicates found)")
+        finally:
+            if executor is not None:
+                executor.shutdown()
         return duplicates
 
 
@@ -573,10 +740,16 @@ class FileIndex:
         dir_id_map: Dict[Path, int] = {self.root_path: 0}
         next_dir_id = 1
         
-        all_entries: List[FileEntry] = [e for entries in self.size_index.values() for e in entries]
+        all_entries: List[FileEntry] = list(self.iter_entries())
         
-        # Discover all unique directories and assign IDs
-        all_dirs = {entry.path.parent for entry in all_entries}
+        # Discover all unique directories and assign IDs. Include every
+        # ancestor up to the root: a directory holding only subdirectories
+        # still needs an entry, or nothing below it could be linked up
+        all_dirs = set()
+        for parent in {entry.path.parent for entry in all_entries}:
+            while parent not in all_dirs and parent != self.root_path and parent != parent.parent:
+                all_dirs.add(parent)
+                parent = parent.parent
         for d in sorted(all_dirs, key=lambda p: len(p.parts)):
             if d not in dir_id_map:
                 dir_id_map[d] = next_dir_id
@@ -591,11 +764,14 @@ class FileIndex:
             if dir_id == 0: continue
             try:
                 parent_id = dir_id_map[dir_path.parent]
-                mtime = int(dir_path.stat().st_mtime)
-                # Directories are stored with their negative ID as the size
-                elm.append((mtime, -dir_id, parent_id, dir_path.name))
-            except (OSError, KeyError):
+            except KeyError:
                 continue
+            try:
+                mtime = int(dir_path.stat().st_mtime)
+            except OSError:
+                mtime = 0  # Keep the directory (and so its files) even if it vanished
+            # Directories are stored with their negative ID as the size
+            elm.append((mtime, -dir_id, parent_id, dir_path.name))
         
         # Add files to elm list and update directory stats
         for entry in all_entries:
@@ -617,10 +793,16 @@ class FileIndex:
         total_catalog_size = sum(s['total_size'] for s in dir_stats.values())
         info[0] = (0, total_file_count, total_catalog_size)
 
+        # Size/mtime ranges of the files, for index-level pruning at search time
+        ranges = None
+        if all_entries:
+            ranges = (min(e.size for e in all_entries), max(e.size for e in all_entries),
+                      min(e.mtime for e in all_entries), max(e.mtime for e in all_entries))
+
         # 4. Write the CAF file
-        self._write_caf(caf_path, elm, info)
+        self._write_caf(caf_path, elm, info, ranges)
 
-    def _write_caf(self, caf_path: Path, elm: List, info: List):
+    def _write_caf(self, caf_path: Path, elm: List, info: List, ranges: Optional[Tuple[int, int, int, int]] = None):
         """Private helper to write the prepared data to a binary .caf file."""
         with caf_path.open('wb') as buffer:
             # Header
@@ -634,6 +816,8 @@ class FileIndex:
 
             # Comment with hash info
             comment = f"Universal Search Index (hash: {self.hash_algo if self.use_hash else 'none'})"
+            if ranges:
+                comment += " [size: %d-%d; mtime: %d-%d]" % ranges
             self._write_string(buffer, comment)
             
             buffer.write(struct.pack('<f', 0.0)) # Free size
@@ -646,13 +830,14 @@ class FileIndex:
                 buffer.write(struct.pack('<l', file_count))
                 buffer.write(struct.pack('<d', total_size))
 
-            # Element (file/dir) block
-            buffer.write(struct.pack('<l', len(elm)))
+            # Element (file/dir) block, assembled in memory and written at once
+            elm_head = struct.Struct('<LqL')
+            block = bytearray(struct.pack('<l', len(elm)))
             for mtime, size, parent_id, name in elm:
-                buffer.write(struct.pack('<L', mtime))
-                buffer.write(struct.pack('<q', size))
-                buffer.write(struct.pack('<L', parent_id))
-                self._write_string(buffer, name)
+                block += elm_head.pack(mtime, size, parent_id)
+                block += name.encode('latin-1', errors='replace')
+                block += b'\x00'
+            buffer.write(block)
 
     @classmethod
     def load_from_caf_old(cls, caf_path: Path, use_hash: bool, hash_algo: str) -> Optional['FileIndex']:
@@ -765,4 +950,124 @@ class FileIndex:
     @staticmethod
     def _write_string(buffer, text: str):
         buffer.write(text.encode('latin-1', errors='replace'))
-        buffer.write(b'\x00')
\ No newline at end of file
+        buffer.write(b'\x00')
+
+
+# Parsed indexes are pickled here so later runs (e.g. repeated CLI calls) skip
+# CAF parsing; entries are only used while the CAF's mtime and size match.
+# Deleting the folder clears the cache; it is rebuilt on demand.
+PARSED_INDEX_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'catfish'
+# Bump when FileIndex/FileEntry or the pickle layout change; older files are then pruned
+PARSED_INDEX_CACHE_VERSION = 1
+# Pickles unused for this long, or whose CAF is gone or rewritten, are pruned
+PARSED_INDEX_CACHE_MAX_AGE = 30 * 24 * 3600
+# Least recently used pickles are pruned beyond this total
+PARSED_INDEX_CACHE_MAX_BYTES = 1 << 30
+
+def _parsed_index_cache_file(caf_path_str: str) -> Path:
+    key = hashlib.sha1(caf_path_str.encode('utf-8')).hexdigest()
+    return PARSED_INDEX_CACHE_DIR / f"v{PARSED_INDEX_CACHE_VERSION}-{key}.pkl"
+
+def _read_cache_header(f) -> Tuple[str, int, int]:
+    """(caf_path_str, mtime_ns, file_size) from the pickle written ahead of the index."""
+    version, caf_path_str, mtime_ns, file_size = pickle.load(f)
+    if version != PARSED_INDEX_CACHE_VERSION:
+        raise ValueError(f"Parsed index cache version {version}")
+    return caf_path_str, mtime_ns, file_size
+
+def _prune_parsed_index_cache(keep: Path):
+    """
+    Best effort: delete pickles of another cache version, whose CAF is gone or
+    has changed, or that went unused for PARSED_INDEX_CACHE_MAX_AGE; then the
+    least recently used ones until the rest fit PARSED_INDEX_CACHE_MAX_BYTES.
+    """
+    now = time.time()
+    kept = []
+    for cache_file in PARSED_INDEX_CACHE_DIR.glob('*.pkl'):
+        try:
+            stat_info = cache_file.stat()
+            if cache_file != keep:
+                stale = now - stat_info.st_mtime > PARSED_INDEX_CACHE_MAX_AGE
+                if not stale:
+                    try:
+                        with cache_file.open('rb') as f:
+                            caf_path_str, mtime_ns, file_size = _read_cache_header(f)
+                        caf_stat = os.stat(caf_path_str)
+                        stale = (caf_stat.st_mtime_ns, caf_stat.st_size) != (mtime_ns, file_size)
+                    except Exception:
+                        stale = True  # CAF gone, another cache version, or unreadable
+                if stale:
+                    cache_file.unlink()
+                    continue
+            kept.append((stat_info.st_mtime, stat_info.st_size, cache_file))
+        except OSError:
+            pass
+    
+    total = sum(size for _, size, _ in kept)
+    for _, size, cache_file in sorted(kept, key=lambda k: k[0]):
+        if total <= PARSED_INDEX_CACHE_MAX_BYTES:
+            break
+        if cache_file != keep:
+            try:
+                cache_file.unlink()
+                total -= size
+            except OSError:
+                pass
+
+# Parsed indexes kept in memory, most recently used last: path -> (mtime_ns, size, index).
+# A large index takes hundreds of MB, so only a few are kept, and one per path.
+PARSED_INDEX_MEMORY_ENTRIES = 4
+_parsed_indexes: 'OrderedDict[str, Tuple[int, int, FileIndex]]' = OrderedDict()
+_parsed_indexes_lock = threading.Lock()
+
+def _load_from_caf_cached(caf_path_str: str, mtime_ns: int, file_size: int) -> Optional[FileIndex]:
+    """Parse a CAF file once per (path, mtime, size); see FileIndex.load_from_caf_cached."""
+    with _parsed_indexes_lock:
+        cached = _parsed_indexes.get(caf_path_str)
+        if cached is not None and cached[:2] == (mtime_ns, file_size):
+            _parsed_indexes.move_to_end(caf_path_str)
+            return cached[2]
+    
+    index = _load_parsed_index(caf_path_str, mtime_ns, file_size)
+    if index is not None:
+        with _parsed_indexes_lock:
+            # Replaces the index parsed from an older version of the same file
+            _parsed_indexes[caf_path_str] = (mtime_ns, file_size, index)
+            _parsed_indexes.move_to_end(caf_path_str)
+            while len(_parsed_indexes) > PARSED_INDEX_MEMORY_ENTRIES:
+                _parsed_indexes.popitem(last=False)
+    return index
+
+def _load_parsed_index(caf_path_str: str, mtime_ns: int, file_size: int) -> Optional[FileIndex]:
+    """The parsed index from its pickle if that is current, else parse the CAF and pickle it."""
+    cache_file = _parsed_index_cache_file(caf_path_str)
+    try:
+        with cache_file.open('rb') as f:
+            if _read_cache_header(f) == (caf_path_str, mtime_ns, file_size):
+                index = pickle.load(f)
+                os.utime(cache_file)  # Age counts from the last use
+                return index
+    except Exception:
+        pass  # Missing, stale format or unreadable: parse the CAF instead
+    
+    index = FileIndex.load_from_caf(Path(caf_path_str), False, 'md5')
+    if index is not None:
+        # Best effort; write to a temp file first so readers never see half a pickle.
+        # The header goes first, so pruning can check the CAF without loading the index.
+        tmp_name = None
+        try:
+            PARSED_INDEX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('wb', dir=PARSED_INDEX_CACHE_DIR, suffix='.tmp', delete=False) as f:
+                tmp_name = f.name
+                pickle.dump((PARSED_INDEX_CACHE_VERSION, caf_path_str, mtime_ns, file_size), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, cache_file)
+            _prune_parsed_index_cache(keep=cache_file)
+        except Exception:
+            if tmp_name:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+    return index
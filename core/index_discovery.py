@@ -2,6 +2,7 @@
 
 """Index discovery and management."""
 import struct
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path, PureWindowsPath, PurePosixPath
 from typing import List, Optional
 from datetime import datetime as dt
@@ -17,27 +18,37 @@ class IndexDiscovery:
     
     def discover_indices(self) -> List[Path]:
         """Discover all .caf index files in configured locations."""
-        indices = []
         search_locations = self.config.get('index_search_locations', [])
         
-        for location_str in search_locations:
-            try:
-                location = Path(location_str)
-                if location.exists() and location.is_dir():
-                    # Find all .caf files
-                    for caf_file in location.glob('*.caf'):
-                        if caf_file.is_file():
-                            indices.append(caf_file)
-                    # Also search one level deep
-                    for subdir in location.iterdir():
-                        if subdir.is_dir():
-                            for caf_file in subdir.glob('*.caf'):
-                                if caf_file.is_file():
-                                    indices.append(caf_file)
-            except Exception:
-                continue
+        # Each location is an independent directory walk (often on a network
+        # share), so scan them concurrently and let the I/O waits overlap.
+        indices = set()
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(search_locations)))) as executor:
+            for found in executor.map(self._scan_location, search_locations):
+                indices.update(found)
         
-        return list(set(indices))  # Remove duplicates
+        return list(indices)
+    
+    @staticmethod
+    def _scan_location(location_str: str) -> List[Path]:
+        """Find .caf files in a location and one directory level below it."""
+        indices = []
+        try:
+            location = Path(location_str)
+            if location.exists() and location.is_dir():
+                # Find all .caf files
+                for caf_file in location.glob('*.caf'):
+                    if caf_file.is_file():
+                        indices.append(caf_file)
+                # Also search one level deep
+                for subdir in location.iterdir():
+                    if subdir.is_dir():
+                        for caf_file in subdir.glob('*.caf'):
+                            if caf_file.is_file():
+                                indices.append(caf_file)
+        except Exception:
+            pass
+        return indices
     
     def get_index_info(self, caf_path: Path) -> Optional[IndexInfo]:
         """Extract information about an index file using fast metadata loading."""
@@ -55,7 +66,11 @@ class IndexDiscovery:
         
         # Determine hash method from filename
         name = caf_path.stem.lower()
-        if '_sha256' in name:
+        if '_blake3' in name:
+            hash_method = 'BLAKE3'
+        elif '_xxh3' in name:
+            hash_method = 'XXH3'
+        elif '_sha256' in name:
             hash_method = 'SHA256'
         elif '_sha1' in name:
             hash_method = 'SHA1'
@@ -111,7 +126,11 @@ class IndexDiscovery:
 
                 # Determine hash method from filename
                 name = caf_path.stem.lower()
-                if '_sha256' in name:
+                if '_blake3' in name:
+                    hash_method = 'BLAKE3'
+                elif '_xxh3' in name:
+                    hash_method = 'XXH3'
+                elif '_sha256' in name:
                     hash_method = 'SHA256'
                 elif '_sha1' in name:
                     hash_method = 'SHA1'
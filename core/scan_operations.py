@@ -23,12 +23,13 @@ def run_scan_with_progress(config: ScanConfig, parent, translator_get_func) -> L
     
     def update_progress_from_queue():
         """Safely updates GUI from main thread by checking the queue"""
+        latest_progress = None
         try:
             while True:
                 message_type, operation, details = progress_queue.get_nowait()
                 if message_type == "progress":
-                    progress_window.update_operation(operation)
-                    progress_window.update_details(details)
+                    # Only the newest progress message is shown; earlier ones are stale
+                    latest_progress = (operation, details)
                 elif message_type == "error":
                     from tkinter import messagebox
                     messagebox.showerror(translator_get_func('error'), translator_get_func('scan_failed', details))
@@ -38,8 +39,12 @@ def run_scan_with_progress(config: ScanConfig, parent, translator_get_func) -> L
         except queue.Empty:
             pass
         
-        # Reschedule this check if thread is still running
-        if scan_thread_obj.is_alive():
+        if latest_progress:
+            progress_window.update_operation(latest_progress[0])
+            progress_window.update_details(latest_progress[1])
+        
+        # Reschedule this check if thread is still running or left messages behind
+        if scan_thread_obj.is_alive() or not progress_queue.empty():
             progress_window.root.after(100, update_progress_from_queue)
     
     def progress_callback(operation, details):
@@ -55,7 +60,9 @@ def run_scan_with_progress(config: ScanConfig, parent, translator_get_func) -> L
             if not progress_window.cancelled.is_set() and dest_index:
                 # Find duplicates
                 duplicates = find_duplicates_with_locations(config.source_path, dest_index, 
-                                                          progress_callback, progress_window.cancelled)
+                                                          progress_callback, progress_window.cancelled,
+                                                          config.skip_hash_when_unambiguous,
+                                                          config.verify_contents)
             
         except Exception as e:
             progress_queue.put(("error", "Error", str(e)))
@@ -90,12 +97,13 @@ def run_scan_with_progress_enhanced(config: ScanConfig, parent, translator_get_f
     progress_queue = queue.Queue()
     
     def update_progress_from_queue():
+        latest_progress = None
         try:
             while True:
                 message_type, operation, details = progress_queue.get_nowait()
                 if message_type == "progress":
-                    progress_window.update_operation(operation)
-                    progress_window.update_details(details)
+                    # Only the newest progress message is shown; earlier ones are stale
+                    latest_progress = (operation, details)
                 elif message_type == "error":
                     from tkinter import messagebox
                     messagebox.showerror(translator_get_func('error'), translator_get_func('scan_failed', details))
@@ -105,7 +113,11 @@ def run_scan_with_progress_enhanced(config: ScanConfig, parent, translator_get_f
         except queue.Empty:
             pass
         
-        if scan_thread_obj.is_alive():
+        if latest_progress:
+            progress_window.update_operation(latest_progress[0])
+            progress_window.update_details(latest_progress[1])
+        
+        if scan_thread_obj.is_alive() or not progress_queue.empty():
             progress_window.root.after(100, update_progress_from_queue)
     
     def progress_callback(operation, details):
@@ -119,7 +131,9 @@ def run_scan_with_progress_enhanced(config: ScanConfig, parent, translator_get_f
             
             if not progress_window.cancelled.is_set() and dest_index:
                 duplicates = find_duplicates_with_locations(config.source_path, dest_index, 
-                                                          progress_callback, progress_window.cancelled)
+                                                          progress_callback, progress_window.cancelled,
+                                                          config.skip_hash_when_unambiguous,
+                                                          config.verify_contents)
             
         except Exception as e:
             progress_queue.put(("error", "Error", str(e)))
@@ -168,7 +182,7 @@ def build_destination_index_selective(config: ScanConfig, progress_callback=None
         if config.reuse_indices and not force_recreate and caf_path.exists():
             if progress_callback: 
                 progress_callback(f"Loading index for {dest_path.name}", "Please wait...")
-            dest_index = FileIndex.load_from_caf(caf_path, config.use_hash, config.hash_algo)
+            dest_index = FileIndex.load_from_caf_cached(caf_path, config.use_hash, config.hash_algo)
         
         # Build new index if needed
         if not dest_index:
@@ -3,8 +3,10 @@
 """Core search and duplicate detection logic."""
 import os
 import re
+import sys
+import fnmatch
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from threading import Event
 from collections import defaultdict
 from datetime import datetime as dt
@@ -12,40 +14,164 @@ from utils.i18n import translator as t
 
 from core.data_structures import (
     SearchCriteria, SearchResult, DuplicateMatch, 
-    FileEntry, ScanConfig
+    FileEntry, ScanConfig, SearchBounds
 )
 from core.file_index import FileIndex
 from utils.file_utils import filter_overlapping_paths, get_caf_path
 
+def compile_name_pattern(name_pattern: str) -> re.Pattern:
+    """
+    Compile a name pattern once for matching against filenames.
+    Patterns are treated as regex; glob-style patterns such as '*.jpg'
+    that are not valid regex fall back to fnmatch translation, anchored at
+    the start so the matcher's search() must match the whole name.
+    """
+    try:
+        return re.compile(name_pattern, re.IGNORECASE)
+    except re.error as e:
+        if any(c in name_pattern for c in '*?['):
+            try:
+                return re.compile(r'\A' + fnmatch.translate(name_pattern), re.IGNORECASE)
+            except re.error:
+                pass
+        raise ValueError(t.get('invalid_regex', e))
+
+def required_literal(pattern_str: str) -> str:
+    """
+    Return the longest run of plain characters any match of pattern_str must
+    contain (casefolded), or '' if none can be safely determined. Used to
+    reject paths with a cheap substring test before running the regex.
+    """
+    if '|' in pattern_str or '(?' in pattern_str:
+        return ''  # Alternation or inline flags (e.g. verbose mode) make runs unreliable
+    best, run, depth, i = '', [], 0, 0
+    while i < len(pattern_str):
+        c = pattern_str[i]
+        if c in '\\[()?*{.+^$}':
+            if c in '?*{' and run:
+                run.pop()  # Quantified: the preceding character may be absent
+            if len(run) > len(best):
+                best = ''.join(run)
+            run = []
+            if c == '\\':
+                # Skip the escape, including \xhh, \uhhhh, \Uhhhhhhhh, \N{...} and digits
+                i += 1
+                escaped = pattern_str[i:i + 1]
+                if escaped and escaped in 'xuU':
+                    i += {'x': 2, 'u': 4, 'U': 8}[escaped]
+                elif escaped == 'N':
+                    end = pattern_str.find('}', i)
+                    i = end if end >= 0 else len(pattern_str)
+                elif escaped.isdigit():
+                    while pattern_str[i + 1:i + 2].isdigit():
+                        i += 1
+            elif c == '[':
+                # Skip the character class, where ']' may come first (after
+                # an optional '^') or be escaped
+                i += 1
+                if pattern_str[i:i + 1] == '^':
+                    i += 1
+                if pattern_str[i:i + 1] == ']':
+                    i += 1
+                while i < len(pattern_str) and pattern_str[i] != ']':
+                    i += 2 if pattern_str[i] == '\\' else 1
+            elif c == '{':
+                i = max(i, pattern_str.find('}', i))  # Skip the repeat count
+            elif c == '(':
+                depth += 1
+            elif c == ')':
+                depth -= 1
+        elif depth == 0:
+            run.append(c)
+        i += 1
+    if len(run) > len(best):
+        best = ''.join(run)
+    return best.casefold()
+
+def get_name_matcher(criteria: SearchCriteria):
+    """Return the pre-compiled name matcher, compiling it only if the caller did not."""
+    if criteria.name_matcher is not None:
+        return criteria.name_matcher
+    if criteria.name_pattern:
+        return compile_name_pattern(criteria.name_pattern).search
+    return None
+
+def get_mtime_bounds(criteria: SearchCriteria) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Convert the date range to epoch seconds once per search, so entries can be
+    filtered by comparing their integer mtime instead of building a datetime each.
+    """
+    mtime_min = criteria.date_min.timestamp() if criteria.date_min else None
+    mtime_max = criteria.date_max.timestamp() if criteria.date_max else None
+    return mtime_min, mtime_max
+
+def get_search_bounds(criteria: SearchCriteria) -> SearchBounds:
+    """
+    Normalize criteria once per search so the per-file filter is two chained
+    numeric comparisons and an optional regex call, with no None checks.
+    """
+    mtime_min, mtime_max = get_mtime_bounds(criteria)
+    inf = float('inf')
+    return SearchBounds(
+        size_min=criteria.size_min if criteria.size_min is not None else -inf,
+        size_max=criteria.size_max if criteria.size_max is not None else inf,
+        mtime_min=mtime_min if mtime_min is not None else -inf,
+        mtime_max=mtime_max if mtime_max is not None else inf,
+        name_match=get_name_matcher(criteria)
+    )
+
+def index_may_match(meta: Optional[Dict], criteria: SearchCriteria) -> bool:
+    """
+    Check the size/mtime ranges from an index header against the criteria.
+    Returns False only when no file in the index can match; indexes without
+    range metadata (older or foreign CAFs) always have to be searched.
+    """
+    if not meta or 'min_size' not in meta:
+        return True
+    if criteria.size_min is not None and meta['max_size'] < criteria.size_min:
+        return False
+    if criteria.size_max is not None and meta['min_size'] > criteria.size_max:
+        return False
+    mtime_min, mtime_max = get_mtime_bounds(criteria)
+    if mtime_min is not None and meta['max_mtime'] < mtime_min:
+        return False
+    if mtime_max is not None and meta['min_mtime'] > mtime_max:
+        return False
+    return True
+
+def filter_entries(entries: List[FileEntry], name_match, mtime_min: Optional[float],
+                   mtime_max: Optional[float]) -> List[FileEntry]:
+    """
+    Filter a whole size bucket at once: one comprehension pass per active
+    predicate, numeric range first so the name regex only sees survivors.
+    """
+    if mtime_min is not None or mtime_max is not None:
+        lo = mtime_min if mtime_min is not None else float('-inf')
+        hi = mtime_max if mtime_max is not None else float('inf')
+        entries = [e for e in entries if lo <= e.mtime <= hi]
+    if name_match:
+        entries = [e for e in entries if name_match(e.path.name)]
+    return entries
+
 def search_files_in_index_with_raw_elm(file_index: FileIndex, criteria: SearchCriteria) -> List[SearchResult]:
     """Optimized search using raw elm data without building full indexes"""
     results = []
     
-    # Compile regex pattern if provided
-    name_regex = None
-    if criteria.name_pattern:
-        try:
-            name_regex = re.compile(criteria.name_pattern, re.IGNORECASE)
-        except re.error as e:
-            raise ValueError(t.get('invalid_regex', e))
+    size_min, size_max, mtime_min, mtime_max, name_match = get_search_bounds(criteria)
+    # Directories are stored with a negative size; never let them through
+    size_min = max(size_min, 0)
     
     # Get or build directory map once
     dir_path_map = file_index._get_or_build_dir_map()
     
     # Search through raw elm data directly
     for mtime, size, parent_id, filename in file_index.raw_elm:
-        # Skip directories (negative size)
-        if size < 0:
-            continue
-        
-        # Size filtering (most efficient first)
-        if criteria.size_min is not None and size < criteria.size_min:
-            continue
-        if criteria.size_max is not None and size > criteria.size_max:
+        # Size and date filtering (numeric, before the regex)
+        if not (size_min <= size <= size_max and mtime_min <= mtime <= mtime_max):
             continue
         
         # Name filtering
-        if name_regex and not name_regex.search(filename):
+        if name_match and not name_match(filename):
             continue
         
         # Check if parent directory exists in map
@@ -55,15 +181,6 @@ def search_files_in_index_with_raw_elm(file_index: FileIndex, criteria: SearchCr
         # Build full path
         path = dir_path_map[parent_id] / filename
         
-        # Date filtering
-        if criteria.date_min or criteria.date_max:
-            file_mtime = dt.fromtimestamp(mtime)
-            
-            if criteria.date_min and file_mtime < criteria.date_min:
-                continue
-            if criteria.date_max and file_mtime > criteria.date_max:
-                continue
-        
         # File passed all criteria
         results.append(SearchResult(
             path=path,
@@ -78,53 +195,35 @@ def search_files_in_index(file_index: FileIndex, criteria: SearchCriteria) -> Li
     """Search for files in index based on criteria with verbose logging"""
     print(f"[SEARCH] Starting search with criteria: name_pattern={criteria.name_pattern}, "
           f"size_min={criteria.size_min}, size_max={criteria.size_max}, "
-          f"date_min={criteria.date_min}, date_max={criteria.date_max}")
+          f"date_min={criteria.date_min}, date_max={criteria.date_max}", file=sys.stderr)
     
     results = []
     
-    # Compile regex pattern if provided
-    name_regex = None
-    if criteria.name_pattern:
-        try:
-            name_regex = re.compile(criteria.name_pattern, re.IGNORECASE)
-            print(f"[SEARCH] Compiled regex pattern: {criteria.name_pattern}")
-        except re.error as e:
-            print(f"[SEARCH] Regex error: {e}")
-            raise ValueError(t.get('invalid_regex', e))
+    _, _, mtime_min, mtime_max, name_match = get_search_bounds(criteria)  # Sizes: see sizes_in_range
     
-    print(f"[SEARCH] Index has {len(file_index.size_index)} size buckets")
-    print(f"[SEARCH] Total files in index: {file_index.total_files}")
+    print(f"[SEARCH] Index has {len(file_index.size_index)} size buckets", file=sys.stderr)
+    print(f"[SEARCH] Total files in index: {file_index.total_files}", file=sys.stderr)
     
     total_entries_examined = 0
     size_buckets_examined = 0
     
-    # Search through all files in index
-    for size, entries in file_index.size_index.items():
+    # Search through the size buckets within range
+    for size in file_index.sizes_in_range(criteria.size_min, criteria.size_max):
         size_buckets_examined += 1
+        entries = file_index.size_index[size]
         
-        # Size filtering
-        if criteria.size_min is not None and size < criteria.size_min:
-            continue
-        if criteria.size_max is not None and size > criteria.size_max:
-            continue
-        
-        print(f"[SEARCH] Examining size bucket {size} with {len(entries)} entries")
+        print(f"[SEARCH] Examining size bucket {size} with {len(entries)} entries", file=sys.stderr)
         
         for entry in entries:
             total_entries_examined += 1
             
-            # Name filtering
-            if name_regex and not name_regex.search(entry.path.name):
+            # Date filtering (numeric, before the regex)
+            if not mtime_min <= entry.mtime <= mtime_max:
                 continue
             
-            # Date filtering
-            if criteria.date_min or criteria.date_max:
-                file_mtime = dt.fromtimestamp(entry.mtime)
-                
-                if criteria.date_min and file_mtime < criteria.date_min:
-                    continue
-                if criteria.date_max and file_mtime > criteria.date_max:
-                    continue
+            # Name filtering
+            if name_match and not name_match(entry.path.name):
+                continue
             
             # File passed all criteria
             result = SearchResult(
@@ -136,10 +235,10 @@ def search_files_in_index(file_index: FileIndex, criteria: SearchCriteria) -> Li
             results.append(result)
             
             if len(results) <= 10:  # Log first 10 matches
-                print(f"[SEARCH] Match found: {entry.path.name} (size: {entry.size})")
+                print(f"[SEARCH] Match found: {entry.path.name} (size: {entry.size})", file=sys.stderr)
     
-    print(f"[SEARCH] Examined {size_buckets_examined} size buckets, {total_entries_examined} total entries")
-    print(f"[SEARCH] Found {len(results)} matching files")
+    print(f"[SEARCH] Examined {size_buckets_examined} size buckets, {total_entries_examined} total entries", file=sys.stderr)
+    print(f"[SEARCH] Found {len(results)} matching files", file=sys.stderr)
     return results
 
 def build_destination_index_selective(config: ScanConfig, progress_callback=None, cancel_event=None, translator_get_func=None) -> Optional[FileIndex]:
@@ -173,7 +272,7 @@ def build_destination_index_selective(config: ScanConfig, progress_callback=None
         if config.reuse_indices and not force_recreate and caf_path.exists():
             if progress_callback: 
                 progress_callback(f"Loading index for {dest_path.name}", "Please wait...")
-            dest_index = FileIndex.load_from_caf(caf_path, config.use_hash, config.hash_algo)
+            dest_index = FileIndex.load_from_caf_cached(caf_path, config.use_hash, config.hash_algo)
         
         # Build new index if needed
         if not dest_index:
@@ -239,7 +338,7 @@ def build_destination_index(config: ScanConfig, progress_callback=None, cancel_e
         # Try to load existing index
         if config.reuse_indices and not config.recreate_indices and caf_path.exists():
             if progress_callback: progress_callback(f"Loading index for {dest_path.name}", "Please wait...")
-            dest_index = FileIndex.load_from_caf(caf_path, config.use_hash, config.hash_algo)
+            dest_index = FileIndex.load_from_caf_cached(caf_path, config.use_hash, config.hash_algo)
         
         # Build new index if needed
         if not dest_index:
@@ -278,41 +377,15 @@ def search_files_in_index_optimized(file_index: FileIndex, criteria: SearchCrite
     """Optimized search for files in index based on criteria."""
     results = []
     
-    # Compile regex pattern if provided
-    name_regex = None
-    if criteria.name_pattern:
-        try:
-            name_regex = re.compile(criteria.name_pattern, re.IGNORECASE)
-        except re.error as e:
-            raise ValueError(f"Invalid regex pattern: {e}")
+    name_match = get_name_matcher(criteria)
+    mtime_min, mtime_max = get_mtime_bounds(criteria)
     
     # Pre-filter size buckets to avoid unnecessary iterations
-    relevant_size_buckets = []
-    for size in file_index.size_index.keys():
-        if criteria.size_min is not None and size < criteria.size_min:
-            continue
-        if criteria.size_max is not None and size > criteria.size_max:
-            continue
-        relevant_size_buckets.append(size)
+    relevant_size_buckets = file_index.sizes_in_range(criteria.size_min, criteria.size_max)
     
     # Search through relevant size buckets only
     for size in relevant_size_buckets:
-        entries = file_index.size_index[size]
-        
-        for entry in entries:
-            # Name filtering (most selective first)
-            if name_regex and not name_regex.search(entry.path.name):
-                continue
-            
-            # Date filtering
-            if criteria.date_min or criteria.date_max:
-                file_mtime = dt.fromtimestamp(entry.mtime)
-                
-                if criteria.date_min and file_mtime < criteria.date_min:
-                    continue
-                if criteria.date_max and file_mtime > criteria.date_max:
-                    continue
-            
+        for entry in filter_entries(file_index.size_index[size], name_match, mtime_min, mtime_max):
             # File passed all criteria
             results.append(SearchResult(
                 path=entry.path,
@@ -324,11 +397,15 @@ def search_files_in_index_optimized(file_index: FileIndex, criteria: SearchCrite
     return results
 
 def find_duplicates_with_locations(source_path: Path, dest_index: FileIndex, 
-                                 progress_callback=None, cancel_event=None) -> List[DuplicateMatch]:
+                                 progress_callback=None, cancel_event=None,
+                                 skip_hash_when_unambiguous: bool = False,
+                                 verify_contents: bool = False) -> List[DuplicateMatch]:
     """Find duplicates with optimized bulk processing"""
     
-    # Create a temporary source index for bulk processing
-    source_index = FileIndex(source_path, dest_index.use_hash, dest_index.hash_algo)
+    # Create a temporary source index for bulk processing. It only needs
+    # sizes: source files are hashed on demand, and only when the
+    # destination has a file of the same size
+    source_index = FileIndex(source_path, False, dest_index.hash_algo)
     
     if progress_callback:
         progress_callback(t.get('finding_duplicates'), f"Indexing source directory: {source_path.name}")
@@ -351,7 +428,8 @@ def find_duplicates_with_locations(source_path: Path, dest_index: FileIndex,
         progress_callback(t.get('finding_duplicates'), f"Comparing against destination indices...")
     
     # Use the optimized bulk duplicate detection
-    return FileIndex.find_all_duplicates_bulk(source_index, dest_index, progress_callback, cancel_event)
+    return FileIndex.find_all_duplicates_bulk(source_index, dest_index, progress_callback, cancel_event,
+                                              skip_hash_when_unambiguous, verify_contents)
 
 # ADD this alternative function for when you want to use the original approach:
 def find_duplicates_with_locations_legacy(source_path: Path, dest_index: FileIndex, 
@@ -7,22 +7,145 @@ supporting both a full GUI and a powerful command-line interface.
 """
 
 import argparse
+import multiprocessing
+import os
 import sys
 import json
 from pathlib import Path
 from datetime import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson  # Optional: faster JSON output for large result sets
+except ImportError:
+    orjson = None
 
 # Import all required components from your project structure
 from core.config import Config
 from core.index_discovery import IndexDiscovery
-from core.search_logic import search_files_in_index, build_destination_index, find_duplicates_with_locations
+from core.search_logic import (search_files_in_index, build_destination_index, find_duplicates_with_locations,
+                               index_may_match, compile_name_pattern)
 from core.data_structures import SearchCriteria, ScanConfig
 from core.file_index import FileIndex
 from utils.i18n import translator as t
-from utils.file_utils import format_size, parse_size, parse_date
+from utils.file_utils import (format_size, format_mtime, format_mtime_iso, parse_size, parse_date,
+                              hash_algo_from_index_name, HASH_ALGORITHMS, find_missing_paths)
 from ui.main_window import UniversalSearchApp
 
 
+# Upper bound on worker processes loading and searching indexes for the CLI
+SEARCH_WORKERS = 8
+
+# Seconds to wait for folder checks (e.g. on a hung network mount) before giving up
+PATH_CHECK_TIMEOUT = 10.0
+
+
+def _load_and_search(caf_path, criteria):
+    """
+    Load one index and search it. Module-level so it can run in a worker
+    process; returns plain (path, size, mtime) tuples to keep pickling cheap,
+    or None if the index was skipped.
+    """
+    # Skip indexes whose size/mtime range cannot satisfy the criteria
+    # before paying for a full load
+    if not index_may_match(FileIndex.load_metadata_only(caf_path), criteria):
+        print(f"[SEARCH] Skipping {caf_path.name}: outside size/date range", file=sys.stderr)
+        return None
+    hash_algo = hash_algo_from_index_name(caf_path)
+    
+    file_index = FileIndex.load_from_caf_cached(caf_path, use_hash=True, hash_algo=hash_algo)
+    if not file_index:
+        return None
+    return [(str(res.path), res.size, res.mtime) for res in search_files_in_index(file_index, criteria)]
+
+
+# Search criteria of the current CLI search, set once per worker process
+_worker_criteria = None
+
+
+def _init_search_worker(criteria):
+    """Pool initializer: receive the criteria (and compiled name pattern) once per worker."""
+    global _worker_criteria
+    _worker_criteria = criteria
+
+
+def _search_in_worker(caf_path):
+    """Search one index with the criteria handed over by _init_search_worker."""
+    return _load_and_search(caf_path, _worker_criteria)
+
+
+def iter_search_results(active_indices, criteria):
+    """
+    Search the indexes, yielding (index file name, [(path, size, mtime), ...])
+    per index in the order given, as soon as each one is ready. Several
+    indexes are searched on a process pool, since the filtering is
+    CPU-bound Python that threads would serialize on the GIL.
+    """
+    workers = min(SEARCH_WORKERS, len(active_indices), os.cpu_count() or 1)
+    if workers <= 1:
+        for caf_path in active_indices:
+            rows = _load_and_search(caf_path, criteria)
+            if rows is not None:
+                yield caf_path.name, rows
+        return
+    # Criteria go to each worker once rather than being pickled with every index
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker,
+                             initargs=(criteria,)) as executor:
+        for caf_path, rows in zip(active_indices, executor.map(_search_in_worker, active_indices)):
+            if rows is not None:
+                yield caf_path.name, rows
+
+
+def search_records(index_name, rows):
+    """Yield the JSON record for each (path, size, mtime) search result row."""
+    for path, size, mtime in rows:
+        yield {
+            "path": path,
+            "size_bytes": size,
+            "modified_iso": format_mtime_iso(mtime),
+            "modified_unix": mtime,
+            "source_index": index_name
+        }
+
+
+def write_json_array(records):
+    """
+    Stream records to stdout as an indented JSON array, one record at a time,
+    producing the same UTF-8 output as json.dumps(list(records), indent=2,
+    ensure_ascii=False) with or without orjson, and without holding the whole
+    list or its serialized text in memory.
+    """
+    sys.stdout.flush()  # Keep ordering with text already printed
+    out = sys.stdout.buffer
+    separator = b"[\n  "
+    for record in records:
+        if orjson is not None:
+            text = orjson.dumps(record, option=orjson.OPT_INDENT_2)
+        else:
+            text = json.dumps(record, indent=2, ensure_ascii=False).encode('utf-8')
+        out.write(separator)
+        out.write(text.replace(b"\n", b"\n  "))
+        separator = b",\n  "
+    out.write(b"[]\n" if separator == b"[\n  " else b"\n]\n")
+    out.flush()
+
+
+def write_ndjson(results_by_index):
+    """Stream search results to stdout as newline-delimited JSON."""
+    count = 0
+    for index_name, rows in results_by_index:
+        records = search_records(index_name, rows)
+        sys.stdout.flush()  # Keep ordering with text already printed
+        # UTF-8 bytes either way, whatever the console's encoding
+        if orjson is not None:
+            sys.stdout.buffer.writelines(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in records)
+        else:
+            sys.stdout.buffer.writelines((json.dumps(r, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8') for r in records)
+        sys.stdout.buffer.flush()
+        count += len(rows)
+    print(f"Found {count} matching file(s).", file=sys.stderr)
+
+
 def run_search_cli(args):
     """Handles the 'search' command in CLI mode."""
     print("--- Running in Search Mode ---", file=sys.stderr)
@@ -38,63 +161,101 @@ def run_search_cli(args):
     print(f"Searching across {len(active_indices)} active index file(s)...", file=sys.stderr)
 
     try:
+        # Compile the pattern once here so an invalid regex fails before any
+        # index is loaded and every search below reuses the same matcher
+        name_matcher = compile_name_pattern(args.pattern).search if args.pattern else None
         criteria = SearchCriteria(
             name_pattern=args.pattern,
             size_min=parse_size(args.size_min) if args.size_min else None,
             size_max=parse_size(args.size_max) if args.size_max else None,
             date_min=parse_date(args.date_min) if args.date_min else None,
-            date_max=parse_date(args.date_max) if args.date_max else None
+            date_max=parse_date(args.date_max) if args.date_max else None,
+            name_matcher=name_matcher
         )
     except ValueError as e:
         print(f"Error: Invalid search criteria. {e}", file=sys.stderr)
         sys.exit(1)
 
-    all_results = []
-    for caf_path in active_indices:
-        name = caf_path.stem.lower()
-        hash_algo = 'sha256' if '_sha256' in name else 'sha1' if '_sha1' in name else 'md5'
-        
-        file_index = FileIndex.load_from_caf(caf_path, use_hash=True, hash_algo=hash_algo)
-        if file_index:
-            results = search_files_in_index(file_index, criteria)
-            for res in results:
-                all_results.append({'result': res, 'index_name': caf_path.name})
+    if args.output == 'ndjson':
+        # One JSON object per line, written as each index is searched, so
+        # memory stays bounded by the largest single index's results
+        write_ndjson(iter_search_results(active_indices, criteria))
+        return
 
     if args.output == 'json':
-        json_results = [
+        # Records are serialized as each index's results arrive; no list of dicts
+        write_json_array(
+            record
+            for index_name, rows in iter_search_results(active_indices, criteria)
+            for record in search_records(index_name, rows)
+        )
+        return
+
+    # Column-wise (struct-of-arrays) result storage: no per-result dict
+    paths, sizes, mtimes, index_names = [], [], [], []
+    for index_name, rows in iter_search_results(active_indices, criteria):
+        paths.extend(row[0] for row in rows)
+        sizes.extend(row[1] for row in rows)
+        mtimes.extend(row[2] for row in rows)
+        index_names.extend([index_name] * len(rows))
+
+    # Text output
+    if not paths:
+        print("No matching files found.")
+        return
+    
+    lines = [
+        f"{format_size(size):>10s} | {format_mtime(mtime)} | [{index_name}] {path}"
+        for path, size, mtime, index_name in zip(paths, sizes, mtimes, index_names)
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+    print(f"\nFound {len(paths)} matching file(s).", file=sys.stderr)
+
+
+def dupe_records(duplicates):
+    """Yield the JSON record for each duplicate match, one at a time."""
+    for match in duplicates:
+        source_size, source_mtime = match.source_size, match.source_mtime
+        if source_size is None or source_mtime is None:
+            try:
+                source_stat = match.source_file.stat()
+            except FileNotFoundError:
+                continue  # Removed since the scan
+            source_size, source_mtime = source_stat.st_size, source_stat.st_mtime
+        source_info = {
+            "path": str(match.source_file),
+            "size_bytes": source_size,
+            "modified_iso": dt.fromtimestamp(source_mtime).isoformat()
+        }
+        destination_info = [
             {
-                "path": str(item['result'].path),
-                "size_bytes": item['result'].size,
-                "modified_iso": dt.fromtimestamp(item['result'].mtime).isoformat(),
-                "modified_unix": item['result'].mtime,
-                "source_index": item['index_name']
+                "path": str(dest.path),
+                "size_bytes": dest.size,
+                "modified_iso": dt.fromtimestamp(dest.mtime).isoformat()
             }
-            for item in all_results
+            for dest in match.destinations
         ]
-        print(json.dumps(json_results, indent=2))
-    else: # Text output
-        if not all_results:
-            print("No matching files found.")
-            return
-            
-        for item in all_results:
-            result = item['result']
-            modified_time = dt.fromtimestamp(result.mtime).strftime('%Y-%m-%d %H:%M')
-            print(f"{format_size(result.size):>10s} | {modified_time} | [{item['index_name']}] {result.path}")
-        print(f"\nFound {len(all_results)} matching file(s).", file=sys.stderr)
+        yield {
+            "source_file": source_info,
+            "duplicates_found": destination_info
+        }
 
 
 def run_dupes_cli(args):
     """Handles the 'find-dupes' command in CLI mode."""
     print("--- Running in Duplicate Finder Mode ---", file=sys.stderr)
     
-    if not args.source.is_dir():
-        print(f"Error: Source path '{args.source}' is not a valid directory.", file=sys.stderr)
+    # Check all folders at once so slow network mounts are stat'ed in
+    # parallel, and report every bad path in one go
+    not_dirs, unresponsive = find_missing_paths([args.source] + args.destinations, PATH_CHECK_TIMEOUT,
+                                                check=os.path.isdir)
+    for path in not_dirs:
+        role = "Source" if path == args.source else "Destination"
+        print(f"Error: {role} path '{path}' is not a valid directory.", file=sys.stderr)
+    for path in unresponsive:
+        print(f"Error: Path '{path}' did not respond within {PATH_CHECK_TIMEOUT:g}s.", file=sys.stderr)
+    if not_dirs or unresponsive:
         sys.exit(1)
-    for dest in args.destinations:
-        if not dest.is_dir():
-            print(f"Error: Destination path '{dest}' is not a valid directory.", file=sys.stderr)
-            sys.exit(1)
 
     config = ScanConfig(
         source_path=args.source,
@@ -102,7 +263,9 @@ def run_dupes_cli(args):
         use_hash=bool(args.hash),
         hash_algo=args.hash if args.hash else 'md5',
         reuse_indices=args.reuse_indices,
-        recreate_indices=args.recreate_indices
+        recreate_indices=args.recreate_indices,
+        skip_hash_when_unambiguous=args.skip_hash_unambiguous,
+        verify_contents=args.verify
     )
 
     if args.output == 'text':
@@ -120,29 +283,12 @@ def run_dupes_cli(args):
             print("\nError: Could not build a destination index or no files found in destination(s).", file=sys.stderr)
             sys.exit(1)
 
-        duplicates = find_duplicates_with_locations(config.source_path, dest_index, progress_callback=cli_progress)
+        duplicates = find_duplicates_with_locations(config.source_path, dest_index, progress_callback=cli_progress,
+                                                    skip_hash_when_unambiguous=config.skip_hash_when_unambiguous,
+                                                    verify_contents=config.verify_contents)
 
         if args.output == 'json':
-            results = []
-            for match in duplicates:
-                source_info = {
-                    "path": str(match.source_file),
-                    "size_bytes": match.source_file.stat().st_size,
-                    "modified_iso": dt.fromtimestamp(match.source_file.stat().st_mtime).isoformat()
-                }
-                destination_info = [
-                    {
-                        "path": str(dest.path),
-                        "size_bytes": dest.size,
-                        "modified_iso": dt.fromtimestamp(dest.mtime).isoformat()
-                    }
-                    for dest in match.destinations
-                ]
-                results.append({
-                    "source_file": source_info,
-                    "duplicates_found": destination_info
-                })
-            print(json.dumps(results, indent=2))
+            write_json_array(dupe_records(duplicates))
         else: # Text output
             if not duplicates:
                 print("\n--- No duplicate files found. ---")
@@ -201,13 +347,15 @@ Examples:
     search_parser.add_argument('--size-max', type=str, help='Maximum file size')
     search_parser.add_argument('--date-min', type=str, help='Minimum modification date (e.g., "2025-01-01")')
     search_parser.add_argument('--date-max', type=str, help='Maximum modification date')
-    search_parser.add_argument('--output', choices=['text', 'json'], default='text', help='Output format')
+    search_parser.add_argument('--output', choices=['text', 'json', 'ndjson'], default='text', help='Output format')
 
     # --- Find Duplicates Command ---
     dupes_parser = subparsers.add_parser('find-dupes', help='Find duplicate files between a source and destination(s)')
     dupes_parser.add_argument('source', type=Path, help='The source folder to check for duplicates')
     dupes_parser.add_argument('destinations', type=Path, nargs='+', help='One or more destination folders to search within')
-    dupes_parser.add_argument('--hash', choices=['md5', 'sha1', 'sha256'], help='Use a hash algorithm for accuracy (slower).')
+    dupes_parser.add_argument('--hash', choices=HASH_ALGORITHMS, help='Use a hash algorithm for accuracy (slower).')
+    dupes_parser.add_argument('--skip-hash-unambiguous', action='store_true', help='With --hash, treat a single same-name, same-size match as a duplicate without hashing.')
+    dupes_parser.add_argument('--verify', action='store_true', help='Without --hash, confirm name + size matches with a byte-for-byte comparison.')
     dupes_parser.add_argument('--reuse-indices', action='store_true', help='Use existing .caf indexes for destination folders.')
     dupes_parser.add_argument('--recreate-indices', action='store_true', help='Force recreation of all destination indexes.')
     dupes_parser.add_argument('--output', choices=['text', 'json'], default='text', help='Output format')
@@ -226,4 +374,6 @@ Examples:
             print(f"Application error: {e}", file=sys.stderr)
 
 if __name__ == "__main__":
+    # Needed by the index creation process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
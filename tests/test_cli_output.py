@@ -0,0 +1,63 @@
+# tests/test_cli_output.py
+
+"""The CLI's machine-readable search output must parse, whatever else gets logged."""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.file_index import FileIndex
+
+MAIN = Path(__file__).resolve().parent.parent / 'main.py'
+
+
+class SearchOutputTest(unittest.TestCase):
+    """Run 'search --output json/ndjson' over two indexes and parse stdout."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.home = Path(self._tmp.name)
+        index_dir = self.home / 'indexes'
+        index_dir.mkdir()
+        self.expected = set()
+        caf_paths = []
+        for volume in ('alpha', 'beta'):
+            root = self.home / volume
+            root.mkdir()
+            index = FileIndex(root)
+            for name in ('notes.txt', 'ünïcode.txt', 'skip.bin'):
+                path = root / name
+                path.write_text(volume + name, encoding='utf-8')
+                index.add_file(path)
+                if name.endswith('.txt'):
+                    self.expected.add(str(path))
+            caf_path = index_dir / f'{volume}.caf'
+            index.save_to_caf(caf_path)
+            caf_paths.append(str(caf_path))
+        config = {'index_search_locations': [str(index_dir)], 'active_indices': caf_paths}
+        (self.home / '.universal_search_config.json').write_text(json.dumps(config), encoding='utf-8')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, output):
+        env = dict(os.environ, HOME=str(self.home), USERPROFILE=str(self.home))
+        result = subprocess.run([sys.executable, str(MAIN), 'search', '*.txt', '--output', output],
+                                capture_output=True, cwd=self.home, env=env, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr.decode('utf-8', 'replace'))
+        return result.stdout.decode('utf-8')
+
+    def test_json(self):
+        records = json.loads(self._run('json'))
+        self.assertEqual({record['path'] for record in records}, self.expected)
+
+    def test_ndjson(self):
+        lines = self._run('ndjson').splitlines()
+        self.assertEqual({json.loads(line)['path'] for line in lines}, self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
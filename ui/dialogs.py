@@ -1,19 +1,52 @@
 # ui/dialogs.py
 
 """Various dialog windows."""
+import os
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk, messagebox
 from pathlib import Path
 from threading import Thread
+from itertools import islice, repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Optional, List, Dict
 
 from core.config import Config
-from core.file_index import FileIndex
+from core.file_index import FileIndex, stat_and_hash_file
 from utils.i18n import translator as t
+from utils.file_utils import HASH_ALGORITHMS, iter_file_entries, single_threaded_hashing
+
+# Concurrent stat() calls when indexing without hashes
+STAT_WORKERS = 32
+# Hashing processes, one per core; Windows rejects process pools of more than 61 workers
+HASH_WORKERS = min(os.cpu_count() or 1, 61)
+# Paths handed to a pool at a time while the folder walk is still running
+WALK_BATCH = 1024
+
+def _map_in_batches(executor, fn, paths, *args, chunksize=1):
+    """
+    Like executor.map(fn, paths, repeat(arg), ...), which submits its whole
+    input before yielding anything; this submits WALK_BATCH paths at a time,
+    one batch ahead of the results, so they stream in while the walk goes on.
+    """
+    pending = None
+    while True:
+        batch = list(islice(paths, WALK_BATCH))
+        results = None
+        if batch:
+            results = executor.map(fn, batch, *(repeat(arg) for arg in args), chunksize=chunksize)
+        if pending is not None:
+            yield from pending
+        if results is None:
+            return
+        pending = results
 
 class IndexCreationDialog:
     """Dialog for creating new index files."""
     
+    # How often the progress label is refreshed while indexing
+    PROGRESS_POLL_MS = 200
+    
     def __init__(self, parent, folder_path: Path, config: Config):
         self.parent = parent
         self.folder_path = folder_path
@@ -50,7 +83,7 @@ class IndexCreationDialog:
         
         self.hash_algo_var = tk.StringVar(value=self.config.get('default_hash_algo', 'md5'))
         self.hash_combo = ttk.Combobox(hash_frame, textvariable=self.hash_algo_var,
-                                      values=['md5', 'sha1', 'sha256'], width=10, state='readonly')
+                                      values=HASH_ALGORITHMS, width=10, state='readonly')
         self.hash_combo.pack(anchor=tk.W, pady=(5, 0))
         
         # Output file
@@ -109,25 +142,64 @@ class IndexCreationDialog:
         self.progress.start()
         self.progress_var.set("Creating index...")
         
+        use_hash = self.use_hash_var.get()
+        hash_algo = self.hash_algo_var.get()
+        
+        # Progress shared with the worker; the GUI polls it at a fixed rate
+        # instead of the worker posting one Tk event per batch of files
+        self._processed = 0
+        self._found = 0
+        self._total = None
+        self._done = False
+        self.root.after(self.PROGRESS_POLL_MS, self._tick)
+        
         def create_thread():
             try:
-                index = FileIndex(self.folder_path, self.use_hash_var.get(), self.hash_algo_var.get())
+                index = FileIndex(self.folder_path, use_hash, hash_algo)
                 
-                # Count total files first
-                total_files = sum(1 for _ in self.folder_path.rglob('*') if _.is_file())
-                processed = 0
+                def walk():
+                    # Paths are submitted in batches as the walk finds them, so
+                    # files are processed while it is still running; the total is
+                    # only known once the walk ends
+                    for entry in iter_file_entries(self.folder_path):
+                        self._found += 1
+                        yield entry
+                    self._total = self._found
                 
-                # Add files to index
-                for file_path in self.folder_path.rglob('*'):
-                    if file_path.is_file():
-                        index.add_file(file_path)
-                        processed += 1
-                        
-                        if processed % 100 == 0:
-                            self.root.after(0, lambda: self.progress_var.set(
-                                f"Processing files... {processed}/{total_files}"))
+                if use_hash:
+                    # Hashing is CPU bound, so spread it over all cores; results
+                    # are merged into the index here, on this thread. Spawned, not
+                    # forked: this process is running Tk and other threads
+                    with ProcessPoolExecutor(max_workers=HASH_WORKERS,
+                                             mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=single_threaded_hashing) as executor:
+                        paths = (entry.path for entry in walk())
+                        for raw in _map_in_batches(executor, stat_and_hash_file, paths, use_hash, hash_algo,
+                                                   chunksize=64):
+                            if raw:
+                                index.add_raw_entry(raw)
+                            self._processed += 1
+                elif os.name == 'nt':
+                    # Windows fills DirEntry.stat() from the directory listing,
+                    # so a stat-only scan needs no per-file syscall at all
+                    for entry in walk():
+                        try:
+                            index.add_file_with_stat(Path(entry.path), entry.stat())
+                        except OSError:
+                            pass
+                        self._processed += 1
+                else:
+                    # Stat-only scans are bound by syscall latency (especially on
+                    # network shares); keep many stat() calls in flight at once
+                    with ThreadPoolExecutor(max_workers=STAT_WORKERS) as executor:
+                        paths = (entry.path for entry in walk())
+                        for raw in _map_in_batches(executor, stat_and_hash_file, paths, False, hash_algo):
+                            if raw:
+                                index.add_raw_entry(raw)
+                            self._processed += 1
                 
                 # Save index
+                self._done = True
                 self.root.after(0, lambda: self.progress_var.set("Saving index file..."))
                 index.save_to_caf(output_path)
                 
@@ -135,14 +207,26 @@ class IndexCreationDialog:
                 self.root.after(0, self.creation_success)
                 
             except Exception as e:
+                self._done = True
                 self.root.after(0, lambda: self.creation_error(str(e)))
         
         thread = Thread(target=create_thread)
         thread.daemon = True
         thread.start()
     
+    def _tick(self):
+        """Refresh the progress label from the worker's counters until it finishes."""
+        if self._done:
+            return
+        if self._total is not None:
+            self.progress_var.set(f"Processing files... {self._processed}/{self._total}")
+        elif self._found:
+            self.progress_var.set(f"Scanning folder... {self._found} files found")
+        self.root.after(self.PROGRESS_POLL_MS, self._tick)
+    
     def creation_success(self):
         """Handle successful index creation."""
+        FileIndex.clear_load_cache()
         self.progress.stop()
         self.progress_var.set("Index created successfully!")
         messagebox.showinfo("Success", f"Index file created:\n{self.output_var.get()}")
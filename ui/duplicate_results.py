@@ -2,27 +2,106 @@
 
 """Duplicate results management window."""
 import re
+import time
+import signal
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Optional, Set
 from datetime import datetime as dt
 
 from core.data_structures import DuplicateMatch
+from core.search_logic import required_literal
 from utils.i18n import translator as t
 from utils.platform_utils import get_screen_geometry, calculate_window_geometry, open_file_or_folder
-from utils.file_utils import format_size, get_platform_info, get_default_script_name, escape_script_path
+from utils.file_utils import format_size, get_platform_info, get_default_script_name
 from utils.platform_utils import open_file_or_folder, FileOperationError, make_script_executable
 
+# Characters with a special meaning in a regex; filters without any are plain substrings
+_REGEX_META_RE = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+
+# A kilobyte of path-like text a new filter pattern must get through quickly before it
+# is run on every item: slow shapes such as nested quantifiers show up on it
+_FILTER_PROBE_TEXT = ('/home/user/documents/projects/some_long_directory_name_here/'
+                      'file_name_v2 (copy).txt\n' * 12)[:1024]
+
+
+class _FilterTimeout(Exception):
+    """Raised when applying the filter regex takes longer than allowed."""
+
+
+@contextmanager
+def _time_limit(seconds: float):
+    """
+    Raise _FilterTimeout in the block after the given time. The regex engine
+    checks for signals while matching, so this also interrupts catastrophic
+    backtracking. Needs SIGALRM on the main thread; elsewhere (e.g. Windows)
+    the block runs unlimited. Any handler and timer already set are restored.
+    """
+    if not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    
+    def on_alarm(signum, frame):
+        raise _FilterTimeout()
+    
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    started = time.monotonic()
+    previous_delay, previous_interval = signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        if previous_delay:
+            remaining = max(previous_delay - (time.monotonic() - started), 0.001)
+            signal.setitimer(signal.ITIMER_REAL, remaining, previous_interval)
+
+
 class DuplicateResultsWindow:
     """Window for displaying and managing duplicate results."""
     
+    # Quiet period after the last keystroke before the filter is applied
+    FILTER_DEBOUNCE_MS = 150
+    # Tree operations between redraws while filling or re-filtering the tree
+    TREE_INSERT_BATCH = 500
+    # Concurrent unlink calls when deleting selected files
+    DELETE_WORKERS = 16
+    # Items checked per Tk callback while filtering, keeping the window responsive
+    FILTER_CHUNK = 10000
+    # Seconds one chunk may take before the pattern is rejected as too slow
+    FILTER_TIME_LIMIT = 1.0
+    # Seconds a new pattern may take on _FILTER_PROBE_TEXT before any item is filtered
+    FILTER_PROBE_LIMIT = 0.05
+    
     def __init__(self, parent, duplicates: List[DuplicateMatch], method: str):
         self.parent = parent
         self.duplicates = duplicates
         self.method = method
         self.selected_for_deletion = set()
+        self._selected_size = 0  # Running byte total of selected_for_deletion
         self.action = None
+        self._pending_filter = None  # Debounce timer or next chunk of a filter pass
+        # (filter text, compiled pattern, required literal, whether the text is only that literal)
+        self._filter_cache = (None, None, '', False)
+        self._slow_filter = None  # Last filter text that hit FILTER_TIME_LIMIT
+        
+        # Per-item data kept on the Python side (filled by populate_tree) so
+        # filtering and selection need no Tcl round trips per item
+        self._all_items: List[str] = []         # Tree order: each source, then its destinations
+        self._item_parent: Dict[str, str] = {}  # '' for source items
+        self._item_paths: Dict[str, str] = {}
+        self._item_paths_lower: Dict[str, str] = {}  # Casefolded, for the literal prefilter
+        self._item_sizes: Dict[str, int] = {}  # For selection totals without stat calls
+        self._item_is_source: Dict[str, bool] = {}
+        self._item_labels: Dict[str, str] = {}  # Row text after the checkbox, for rows in the tree
+        self._item_hidden: Set[str] = set()
+        # Sources whose destination rows are not in the tree yet -> index into duplicates
+        self._pending_children: Dict[str, int] = {}
         
         self.root = tk.Toplevel(parent.root)
         self.root.title(t.get('duplicate_manager'))
@@ -32,6 +111,11 @@ class DuplicateResultsWindow:
         geometry = calculate_window_geometry(screen_width, screen_height)
         self.root.geometry(geometry)
         
+        # Source sizes for the header total and the rows: as recorded when the
+        # duplicates were found, stat'ing (once) only where that is missing
+        self._source_sizes = [d.source_size if d.source_size is not None else self._stat_size(d.source_file)
+                              for d in self.duplicates]
+        
         self.setup_ui()
         self.populate_tree()
         
@@ -39,13 +123,20 @@ class DuplicateResultsWindow:
         self.root.transient(parent.root)
         self.root.grab_set()
 
+    @staticmethod
+    def _stat_size(path: Path) -> Optional[int]:
+        """Return the file's current size, or None if it cannot be stat'ed."""
+        try:
+            return path.stat().st_size
+        except OSError:
+            return None
+
     def show_in_folder(self):
         """Show selected file in folder if it exists with error handling."""
         selection = self.tree.selection()
-        if selection:
+        if selection and selection[0] in self._item_paths:
             item = selection[0]
-            path_str = self.tree.item(item, 'values')[1]
-            path = Path(path_str)
+            path = Path(self._item_paths[item])
             try:
                 open_file_or_folder(path, open_folder=True)
             except FileNotFoundError:
@@ -62,10 +153,7 @@ class DuplicateResultsWindow:
         info_frame = ttk.LabelFrame(main_frame, text=t.get('information'), padding=10)
         info_frame.pack(fill=tk.X, pady=(0, 10))
         
-        try:
-            total_size_bytes = sum(d.source_file.stat().st_size for d in self.duplicates if d.source_file.exists())
-        except:
-            total_size_bytes = 0
+        total_size_bytes = sum(size for size in self._source_sizes if size is not None)
             
         info_text = f"{t.get('method')}: {self.method} | {t.get('found')} {len(self.duplicates)} {t.get('files_with_duplicates')} | {t.get('total_size')}: {format_size(total_size_bytes)}"
         ttk.Label(info_frame, text=info_text).pack(anchor=tk.W)
@@ -89,7 +177,9 @@ class DuplicateResultsWindow:
         
         ttk.Label(filter_inner, text=t.get('regex_filter')).pack(side=tk.LEFT)
         self.filter_var = tk.StringVar()
-        self.filter_entry = ttk.Entry(filter_inner, textvariable=self.filter_var)
+        # Invalid or too slow patterns are shown in red
+        ttk.Style(self.root).map('Filter.TEntry', foreground=[('invalid', 'red')])
+        self.filter_entry = ttk.Entry(filter_inner, textvariable=self.filter_var, style='Filter.TEntry')
         self.filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 10))
         self.filter_entry.bind('<KeyRelease>', self.on_filter_change)
         
@@ -125,6 +215,7 @@ class DuplicateResultsWindow:
         self.tree.bind('<space>', self.on_space_key)
         self.tree.bind('<Control-c>', self.copy_path_to_clipboard)
         self.tree.bind('<Double-Button-1>', self.on_double_click)
+        self.tree.bind('<<TreeviewOpen>>', self.on_tree_open)
         
         # Action buttons
         action_frame = ttk.Frame(main_frame)
@@ -142,22 +233,80 @@ class DuplicateResultsWindow:
         status_bar.pack(fill=tk.X, pady=(10, 0))
 
     def populate_tree(self):
-        """Populate the tree view with duplicates - enhanced for both source and destination selection"""
-        for i, duplicate in enumerate(self.duplicates):
-            try:
-                source_size = duplicate.source_file.stat().st_size
-                source_id = self.tree.insert('', 'end', 
-                                        text=f"☐ {duplicate.source_file.name}",
-                                        values=(f"{source_size:,} bytes", str(duplicate.source_file)),
-                                        tags=('source', f'dup_{i}'))
-                
-                for j, dest in enumerate(duplicate.destinations):
-                    dest_id = self.tree.insert(source_id, 'end',
-                                text=f"☐ → {dest.path.name}",
-                                values=(f"{dest.size:,} bytes", str(dest.path)),
-                                tags=('destination', f'dup_{i}_{j}'))
-            except OSError:
-                continue
+        """
+        Populate the tree view with duplicates - enhanced for both source and
+        destination selection. Sources start collapsed, so their destination
+        rows are only inserted when first expanded (see on_tree_open); until
+        then a placeholder child keeps the expand arrow.
+        """
+        for i, (duplicate, source_size) in enumerate(zip(self.duplicates, self._source_sizes)):
+            if i and i % self.TREE_INSERT_BATCH == 0:
+                self.root.update_idletasks()  # Let Tk draw what is there so far
+            if source_size is None:
+                continue  # Source no longer accessible
+            source_path = str(duplicate.source_file)
+            label = duplicate.source_file.name
+            source_id = self.tree.insert('', 'end', iid=f'dup_{i}',
+                                    text=f"☐ {label}",
+                                    values=(f"{source_size:,} bytes", source_path))
+            self._remember_item(source_id, '', source_path, source_size, True)
+            self._item_labels[source_id] = label
+            
+            for j, dest in enumerate(duplicate.destinations):
+                self._remember_item(f'dup_{i}_{j}', source_id, str(dest.path), dest.size, False)
+            if duplicate.destinations:
+                self.tree.insert(source_id, 'end', iid=f'{source_id}_pending', text="…")
+                self._pending_children[source_id] = i
+    
+    def on_tree_open(self, event):
+        """Insert a source's destination rows the first time it is expanded."""
+        self._load_children(self.tree.focus())
+    
+    def _load_children(self, source_id):
+        """Replace a source's placeholder with its destination rows, honoring the current filter."""
+        i = self._pending_children.pop(source_id, None)
+        if i is None:
+            return
+        self.tree.delete(f'{source_id}_pending')
+        dest_ids = []
+        for j, dest in enumerate(self.duplicates[i].destinations):
+            label = f"→ {dest.path.name}"
+            dest_id = self.tree.insert(source_id, 'end', iid=f'dup_{i}_{j}',
+                                       text=f"☐ {label}",
+                                       values=(f"{dest.size:,} bytes", str(dest.path)))
+            self._item_labels[dest_id] = label
+            dest_ids.append(dest_id)
+        if self._item_hidden.intersection(dest_ids):
+            self.tree.set_children(source_id, *(d for d in dest_ids if d not in self._item_hidden))
+    
+    def _remember_item(self, item, parent, path_str, size, is_source):
+        """Record a tree item's data on the Python side."""
+        self._all_items.append(item)
+        self._item_parent[item] = parent
+        self._item_paths[item] = path_str
+        self._item_paths_lower[item] = path_str.casefold()
+        self._item_sizes[item] = size
+        self._item_is_source[item] = is_source
+    
+    def _forget_items(self, items):
+        """Drop deleted tree items, and the destinations of deleted sources, from the item data."""
+        items = set(items)
+        kept = []
+        for item in self._all_items:
+            if item in items or self._item_parent[item] in items:
+                del self._item_parent[item], self._item_paths[item], self._item_paths_lower[item]
+                del self._item_sizes[item], self._item_is_source[item]
+                self._item_hidden.discard(item)
+                self._item_labels.pop(item, None)
+                self._pending_children.pop(item, None)
+            else:
+                kept.append(item)
+        self._all_items = kept
+        
+        # A filter pass in progress indexes into the item list; restart it
+        if self._pending_filter is not None:
+            self.root.after_cancel(self._pending_filter)
+            self.apply_filter()
 
     def on_selection_mode_change(self):
         """Handle selection mode change between source and destination"""
@@ -167,88 +316,159 @@ class DuplicateResultsWindow:
     def on_tree_click(self, event):
         """Handle tree item clicks for selection - enhanced for mode awareness"""
         item = self.tree.identify_row(event.y)
-        if item:
-            tags = self.tree.item(item, 'tags')
-            mode = self.selection_mode_var.get()
-            
-            if mode == "source" and 'source' in tags and 'hidden' not in tags:
-                self.toggle_selection(item)
-            elif mode == "destination" and 'destination' in tags and 'hidden' not in tags:
+        if item in self._item_is_source and item not in self._item_hidden:
+            # Source items are selectable in source mode, destinations in destination mode
+            if self._item_is_source[item] == (self.selection_mode_var.get() == "source"):
                 self.toggle_selection(item)
 
     def update_status(self):
         """Update status bar with selection count"""
         count = len(self.selected_for_deletion)
         if count > 0:
-            try:
-                total_size = sum(Path(self.tree.item(item, 'values')[1]).stat().st_size 
-                            for item in self.selected_for_deletion)
-                self.status_var.set(f"{t.get('selected')}: {count} files ({total_size/1024/1024:.1f} MB)")
-            except:
-                self.status_var.set(f"{t.get('selected')}: {count} files")
+            total_size = self._selected_size
+            self.status_var.set(f"{t.get('selected')}: {count} files ({total_size/1024/1024:.1f} MB)")
         else:
             self.status_var.set(t.get('no_selection_status'))
     
     def on_filter_change(self, event):
-        """Handle filter text changes and correctly un-hide items."""
+        """Coalesce a burst of filter keystrokes into a single filter pass."""
+        if self._pending_filter is not None:
+            self.root.after_cancel(self._pending_filter)
+        self._pending_filter = self.root.after(self.FILTER_DEBOUNCE_MS, self.apply_filter)
+    
+    def _get_filter_pattern(self, filter_text):
+        """
+        Return (compiled filter regex or None if empty, required literal,
+        whether the filter is just that literal), reusing the last ones while
+        the filter text is unchanged.
+        """
+        if self._filter_cache[0] != filter_text:
+            pattern = re.compile(filter_text, re.IGNORECASE) if filter_text else None
+            self._filter_cache = (filter_text, pattern, required_literal(filter_text),
+                                  bool(filter_text) and not _REGEX_META_RE.search(filter_text))
+        return self._filter_cache[1:]
+    
+    def apply_filter(self):
+        """Apply the filter text to the tree and correctly un-hide items."""
+        self._pending_filter = None
         filter_text = self.filter_var.get()
         
         try:
-            # Compile pattern only if filter_text is not empty
-            pattern = re.compile(filter_text, re.IGNORECASE) if filter_text else None
-            
-            # Iterate through all items and their children
-            for item in self.tree.get_children(''):
-                # Process the parent item
-                self._filter_item(item, pattern)
-                # Process child items
-                for child_item in self.tree.get_children(item):
-                    self._filter_item(child_item, pattern)
-
+            pattern, literal, literal_only = self._get_filter_pattern(filter_text)
         except re.error:
-            # If regex is invalid, do nothing
-            pass
-
-    def _filter_item(self, item, pattern):
-        """Helper to show/hide a single tree item based on a regex pattern."""
-        tags = list(self.tree.item(item, 'tags'))
-        item_path = self.tree.item(item, 'values')[1]
+            # If regex is invalid, flag it and leave the tree as is
+            self.filter_entry.state(['invalid'])
+            return
+        if filter_text == self._slow_filter:
+            self.filter_entry.state(['invalid'])
+            return  # Already rejected; don't stall on it again
+        if pattern is not None and not literal_only and self._too_slow(pattern):
+            self._slow_filter = filter_text
+            self.filter_entry.state(['invalid'])
+            return
         
-        # Determine if the item should be visible
-        is_visible = not pattern or pattern.search(item_path)
-
-        if is_visible:
-            # If it should be visible, REMOVE the 'hidden' tag
-            if 'hidden' in tags:
-                tags.remove('hidden')
-                self.tree.item(item, tags=tuple(tags))
-            # Detach and re-attach to force redraw in correct position
-            parent = self.tree.parent(item)
-            index = self.tree.index(item)
-            self.tree.detach(item)
-            self.tree.move(item, parent, index)
-        else:
-            # If it should be hidden, ADD the 'hidden' tag
-            if 'hidden' not in tags:
-                tags.append('hidden')
-                self.tree.item(item, tags=tuple(tags))
-            # Detach to hide
-            self.tree.detach(item)
+        self._filter_chunk(filter_text, pattern, literal, literal_only, 0, set())
+    
+    def _too_slow(self, pattern) -> bool:
+        """
+        Whether the pattern fails to get through _FILTER_PROBE_TEXT within
+        FILTER_PROBE_LIMIT, so catastrophic backtracking is caught before the
+        first chunk rather than freezing the window on a real path. Only
+        enforced where _time_limit can interrupt the match.
+        """
+        try:
+            with _time_limit(self.FILTER_PROBE_LIMIT):
+                pattern.search(_FILTER_PROBE_TEXT)
+        except _FilterTimeout:
+            return True
+        return False
+    
+    def _filter_chunk(self, filter_text, pattern, literal, literal_only, start, hidden):
+        """
+        Collect the hidden items among the next FILTER_CHUNK items, then
+        schedule the rest, so Tk keeps handling events during a long pass; a
+        new keystroke cancels the remainder through _pending_filter. The tree
+        is only updated once the whole pass is done.
+        """
+        self._pending_filter = None
+        # Decide visibility from the Python-side item data; items hidden
+        # earlier are detached, so tree.get_children would not list them.
+        # Bound methods and dicts are hoisted out of this per-item loop, and a
+        # path lacking the pattern's required literal skips the regex; a
+        # filter without regex syntax is a plain (casefolded) substring test
+        items = self._all_items[start:start + self.FILTER_CHUNK]
+        paths = self._item_paths
+        # The timer interrupts a runaway match where SIGALRM is available; elsewhere
+        # the chunk's duration is checked once it is done
+        started = time.monotonic()
+        try:
+            with _time_limit(self.FILTER_TIME_LIMIT):
+                if pattern is None:
+                    pass
+                elif literal_only:
+                    lower = self._item_paths_lower
+                    hidden.update(item for item in items if literal not in lower[item])
+                elif literal:
+                    search, lower = pattern.search, self._item_paths_lower
+                    hidden.update(item for item in items if literal not in lower[item] or not search(paths[item]))
+                else:
+                    search = pattern.search
+                    hidden.update(item for item in items if not search(paths[item]))
+            timed_out = time.monotonic() - started > self.FILTER_TIME_LIMIT
+        except _FilterTimeout:
+            timed_out = True
+        if timed_out:
+            # Typically catastrophic backtracking: flag it, drop the rest of the pass
+            # and leave the tree as is
+            self._slow_filter = filter_text
+            self.filter_entry.state(['invalid'])
+            return
+        
+        start += self.FILTER_CHUNK
+        if start < len(self._all_items):
+            self._pending_filter = self.root.after(1, self._filter_chunk, filter_text, pattern, literal,
+                                                   literal_only, start, hidden)
+            return
+        self.filter_entry.state(['!invalid'])
+        self._commit_filter(hidden)
+    
+    def _commit_filter(self, hidden):
+        """Bring the tree in line with a completed filter pass's hidden items."""
+        all_items, parent_of = self._all_items, self._item_parent
+        
+        # Only items whose state flipped need tree calls. Rows of sources not
+        # yet expanded are not in the tree; they get the filter when loaded
+        pending = self._pending_children
+        to_hide = [item for item in hidden - self._item_hidden if parent_of[item] not in pending]
+        show_parents = {parent_of[item] for item in self._item_hidden - hidden} - pending.keys()
+        self._item_hidden = hidden
+        
+        # Hide in one call; narrowing the filter while typing needs nothing else
+        if to_hide:
+            self.tree.detach(*to_hide)
+        # Re-attach the visible children of parents that regain items in their
+        # original order, one call per parent
+        if show_parents:
+            visible_children = {parent: [] for parent in show_parents}
+            for item in all_items:
+                if item not in hidden and parent_of[item] in visible_children:
+                    visible_children[parent_of[item]].append(item)
+            for n, (parent, children) in enumerate(visible_children.items(), 1):
+                self.tree.set_children(parent, *children)
+                if n % self.TREE_INSERT_BATCH == 0:
+                    self.root.update_idletasks()
     
     def on_space_key(self, event):
         """Handle space key for selection"""
         item = self.tree.focus()
-        if item:
-            tags = self.tree.item(item, 'tags')
-            if 'source' in tags and 'hidden' not in tags:
-                self.toggle_selection(item)
+        if self._item_is_source.get(item) and item not in self._item_hidden:
+            self.toggle_selection(item)
     
     def on_double_click(self, event):
         """Handle double-click to open file with error handling."""
         item = self.tree.identify_row(event.y)
-        if item and 'hidden' not in self.tree.item(item, 'tags'):
-            path_str = self.tree.item(item, 'values')[1]
-            path = Path(path_str)
+        if item in self._item_paths and item not in self._item_hidden:
+            path = Path(self._item_paths[item])
             try:
                 open_file_or_folder(path)
             except FileNotFoundError:
@@ -258,22 +478,23 @@ class DuplicateResultsWindow:
     
     def toggle_selection(self, item):
         """Toggle selection state of an item"""
-        current_text = self.tree.item(item, 'text')
         if item in self.selected_for_deletion:
             self.selected_for_deletion.remove(item)
-            new_text = current_text.replace('☑', '☐')
+            self._selected_size -= self._item_sizes[item]
+            checkbox = '☐'
         else:
             self.selected_for_deletion.add(item)
-            new_text = current_text.replace('☐', '☑')
+            self._selected_size += self._item_sizes[item]
+            checkbox = '☑'
         
-        self.tree.item(item, text=new_text)
+        self.tree.item(item, text=f"{checkbox} {self._item_labels[item]}")
         self.update_status()
     
     def select_all_filtered(self):
         """Select all visible (filtered) items"""
-        for item in self.tree.get_children():
-            tags = self.tree.item(item, 'tags')
-            if 'source' in tags and 'hidden' not in tags and item not in self.selected_for_deletion:
+        for item in self._all_items:
+            if (self._item_is_source[item] and item not in self._item_hidden
+                    and item not in self.selected_for_deletion):
                 self.toggle_selection(item)
     
     def deselect_all(self):
@@ -288,31 +509,34 @@ class DuplicateResultsWindow:
             return
 
         count = len(self.selected_for_deletion)
-        try:
-            total_size = sum(Path(self.tree.item(item, 'values')[1]).stat().st_size for item in self.selected_for_deletion)
-        except (OSError, IndexError):
-            messagebox.showerror("Error", "Could not calculate size of selected files.")
-            return
+        total_size = self._selected_size
 
         # Safety confirmation dialog
         if not messagebox.askyesno("Confirm Deletion",
                                    f"Are you sure you want to permanently delete {count} files ({format_size(total_size)})?\n\nThis action CANNOT be undone."):
             return
 
-        deleted_count = 0
         failed_deletions = []
+        deleted_items = []
         
-        # Iterate over a copy because we're modifying the set and tree
-        for item in list(self.selected_for_deletion):
-            file_path_str = self.tree.item(item, 'values')[1]
-            file_path = Path(file_path_str)
-            try:
-                file_path.unlink()
-                deleted_count += 1
-                self.tree.delete(item)
+        # Unlink concurrently: each call mostly waits on the filesystem (network
+        # drives in particular). The tree and selection are updated afterwards
+        items = list(self.selected_for_deletion)
+        file_paths = [Path(self._item_paths[item]) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.DELETE_WORKERS, len(items))) as executor:
+            errors = list(executor.map(self._unlink, file_paths))
+        
+        for item, file_path, error in zip(items, file_paths, errors):
+            if error is None:
                 self.selected_for_deletion.remove(item)
-            except OSError as e:
-                failed_deletions.append(f"{file_path.name}: {e}")
+                self._selected_size -= self._item_sizes[item]
+                deleted_items.append(item)
+            else:
+                failed_deletions.append(f"{file_path.name}: {error}")
+        deleted_count = len(deleted_items)
+        if deleted_items:
+            self.tree.delete(*deleted_items)
+        self._forget_items(deleted_items)
         
         # Final report message
         message = f"Successfully deleted {deleted_count} of {count} selected files."
@@ -325,6 +549,15 @@ class DuplicateResultsWindow:
         messagebox.showinfo("Deletion Complete", message)
         self.update_status()
     
+    @staticmethod
+    def _unlink(file_path: Path) -> Optional[OSError]:
+        """Delete one file, returning the error instead of raising it."""
+        try:
+            file_path.unlink()
+            return None
+        except OSError as e:
+            return e
+    
     def generate_script(self):
         """Generate a script file to delete the selected items"""
         if not self.selected_for_deletion:
@@ -348,17 +581,16 @@ class DuplicateResultsWindow:
         
         if filename:
             try:
+                # Assemble the whole script in memory and write it in one call
+                comment = "REM" if platform_info['name'] == 'Windows' else "#"
+                delete_cmd, quote = platform_info['delete_cmd'], platform_info['path_quote']
+                lines = [platform_info['script_header'],
+                         f"{comment} Deletion script generated on {dt.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"]
+                lines.extend(f"{delete_cmd} {quote(self._item_paths[item])}\n" for item in self.selected_for_deletion)
+                lines.append(f"\n{platform_info['echo_cmd']} \"Script finished.\"\n{platform_info['pause_cmd']}\n")
+                
                 with open(filename, 'w', encoding='utf-8', newline='\n') as f:
-                    f.write(platform_info['script_header'])
-                    comment = "REM" if platform_info['name'] == 'Windows' else "#"
-                    f.write(f"{comment} Deletion script generated on {dt.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                    
-                    for item in self.selected_for_deletion:
-                        file_path = Path(self.tree.item(item, 'values')[1])
-                        quoted_path = escape_script_path(file_path)
-                        f.write(f"{platform_info['delete_cmd']} {quoted_path}\n")
-                    
-                    f.write(f"\n{platform_info['echo_cmd']} \"Script finished.\"\n{platform_info['pause_cmd']}\n")
+                    f.write("".join(lines))
                 
                 make_script_executable(Path(filename))
                 messagebox.showinfo("Success", f"Deletion script was successfully saved to:\n{filename}")
@@ -369,13 +601,12 @@ class DuplicateResultsWindow:
     def copy_path_to_clipboard(self, event):
         """Copy selected file path to clipboard"""
         item = self.tree.focus()
-        if item:
-            path_value = self.tree.item(item, 'values')
-            if path_value and len(path_value) > 1:
-                self.root.clipboard_clear()
-                self.root.clipboard_append(path_value[1])
-                self.status_var.set(f"Copied path to clipboard: {Path(path_value[1]).name}")
-                self.root.after(2000, self.update_status)
+        path_str = self._item_paths.get(item)
+        if path_str:
+            self.root.clipboard_clear()
+            self.root.clipboard_append(path_str)
+            self.status_var.set(f"Copied path to clipboard: {Path(path_str).name}")
+            self.root.after(2000, self.update_status)
     
     def new_scan(self):
         """Signal that a new scan should be started"""
@@ -384,4 +615,7 @@ class DuplicateResultsWindow:
     
     def close(self):
         """Close the window"""
+        if self._pending_filter is not None:
+            self.root.after_cancel(self._pending_filter)
+            self._pending_filter = None
         self.root.destroy()
\ No newline at end of file
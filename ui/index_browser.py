@@ -1,27 +1,78 @@
 # ui/index_browser.py
 
 """Index browser for offline content viewing."""
+import os
 import re
+import csv
+import functools
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+from array import array
+from bisect import bisect_right
 from pathlib import Path
-from typing import List
-from datetime import datetime as dt
+from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 from core.file_index import FileIndex
-from core.data_structures import FileEntry
+from core.search_logic import required_literal
 from utils.i18n import translator as t
 from utils.platform_utils import get_screen_geometry, calculate_window_geometry, open_file_or_folder
-from utils.file_utils import format_size, get_display_path, path_is_native_and_exists
+from utils.file_utils import format_size, format_mtime, path_is_native_and_exists
 from utils.platform_utils import open_file_or_folder, FileOperationError
 
+# A filename is the tail of its path, so a filter found in the name is also found in the path,
+# unless it asserts what precedes the match: ^, \A or a lookbehind
+_NAME_ANCHORED_RE = re.compile(r'\^|\\A|\(\?<')
+
+# What the only characters re.IGNORECASE matches to an ASCII letter, but str.lower() does
+# not turn into just that letter, look like once lowercased: dotless i, long s, and the
+# combining dot 'İ' leaves after the 'i'. Without them, an ASCII literal found
+# case-insensitively in a path is also found in its lowercased form
+_IGNORECASE_ONLY_FOLDS = ('\u0131', '\u017f', '\u0307')
+
+@functools.lru_cache(maxsize=64)
+def _compile_filter(filter_text: str) -> Optional[re.Pattern]:
+    """Compile a browser filter case-insensitively, or return None if it is not a valid regex."""
+    try:
+        return re.compile(filter_text, re.IGNORECASE)
+    except re.error:
+        return None
+
+
 class IndexBrowserWindow:
     """Window for browsing index contents without requiring mounted volumes."""
     
+    # Rows added to the tree at a time; more are added as the view nears the end
+    BROWSE_CHUNK = 1000
+    # Quiet period after the last keystroke before the filter is applied
+    FILTER_DEBOUNCE_MS = 150
+    # Concurrent existence checks; each mostly waits on the filesystem
+    EXISTS_WORKERS = 32
+    
     def __init__(self, parent, caf_path: Path):
         self.parent = parent
         self.caf_path = caf_path
-        self.file_entries = []
+        # One entry per indexed file, in path order; built once when the index is loaded
+        self._paths: List[str] = []
+        self._paths_lower: List[str] = []
+        # The lowercased paths joined by NULs, which no path contains, and where each one starts;
+        # str.find over it skips straight past the rows a selective substring filter rejects
+        self._lower_blob = ''
+        self._lower_starts: List[int] = [0]
+        self._blob_folds_ascii = True  # No _IGNORECASE_ONLY_FOLDS characters in the blob
+        self._names: List[str] = []
+        # Packed 8-byte ints rather than lists of int objects
+        self._sizes = array('q')
+        self._mtimes = array('q')
+        self._exists: Optional[List[bool]] = None  # Filled in the background after loading
+        self.rows_shown: List[int] = []  # Filtered and sorted column indexes; row iid = str(column index)
+        self._rows_loaded = 0
+        self._load_pending = False
+        self._pending_filter = None
+        self._shown_filter: Optional[str] = None  # Filter text behind the current rows; '' = unfiltered
+        self._closed = False
+        self._home = str(Path.home())
         
         self.root = tk.Toplevel(parent)
         self.root.title(f"Browse Index: {caf_path.name}")
@@ -32,6 +83,7 @@ class IndexBrowserWindow:
         self.root.geometry(geometry)
         
         self.setup_ui()
+        self.root.protocol('WM_DELETE_WINDOW', self.close)  # The title bar's close button too
         self.load_index_contents()
         
         # Make modal
@@ -85,19 +137,30 @@ class IndexBrowserWindow:
         self.files_tree.column('Path', width=350, minwidth=250)
         self.files_tree.column('Status', width=60, minwidth=50)
         
+        # Configure tag colors
+        self.files_tree.tag_configure('missing', foreground='gray')
+        # we may just use the system default which should adjust to light or dark mode
+        # self.files_tree.tag_configure('exists', foreground='black')
+        
         # Scrollbars
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.files_tree.yview)
+        self.v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.files_tree.yview)
         h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.files_tree.xview)
-        self.files_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.files_tree.configure(yscrollcommand=self._on_tree_scroll, xscrollcommand=h_scrollbar.set)
         
         self.files_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
         
         # Bind events
         self.files_tree.bind('<Double-Button-1>', self.on_file_double_click)
         self.files_tree.bind('<Button-3>', self.on_file_right_click)
         
+        # Context menu, built once and popped up on each right-click
+        self.context_menu = tk.Menu(self.root, tearoff=0)
+        self.context_menu.add_command(label="Copy Path", command=self.copy_selected_path)
+        self.context_menu.add_command(label="Copy Filename", command=self.copy_selected_filename)
+        self.context_menu.add_command(label="Show in Folder", command=self.show_in_folder)
+        
         # Action buttons
         action_frame = ttk.Frame(main_frame)
         action_frame.pack(fill=tk.X, pady=(10, 0))
@@ -112,125 +175,246 @@ class IndexBrowserWindow:
         status_bar.pack(fill=tk.X, pady=(10, 0))
     
     def load_index_contents(self):
-        """Load and display index contents."""
+        """Load the index on a worker thread; the window stays responsive meanwhile."""
+        self.status_var.set("Loading index...")
+        Thread(target=self._load_worker, daemon=True).start()
+    
+    def _load_worker(self):
+        """Worker thread: parse the index and build the columns, then check which files exist."""
         try:
             # Load index using existing FileIndex method
-            file_index = FileIndex.load_from_caf(self.caf_path, False, 'md5')  # Hash doesn't matter for browsing
+            file_index = FileIndex.load_from_caf_cached(self.caf_path, False, 'md5')  # Hash doesn't matter for browsing
             
             if not file_index:
-                self.info_var.set("Failed to load index")
+                self._post(self.info_var.set, "Failed to load index")
                 return
             
-            # Extract all file entries
-            self.file_entries = []
-            for size, entries in file_index.size_index.items():
-                self.file_entries.extend(entries)
-            
-            # Update info
-            total_files = len(self.file_entries)
-            total_size = sum(entry.size for entry in self.file_entries)
-            existing_files = sum(1 for entry in self.file_entries if path_is_native_and_exists(entry.path))
-            
-            info_text = f"Total files: {total_files:,} | Total size: {format_size(total_size)} | "
-            
-            # Fix division by zero error
-            if total_files > 0:
-                percentage = existing_files/total_files*100
-                info_text += f"Existing: {existing_files:,} ({percentage:.1f}%)"
-            else:
-                info_text += f"Existing: {existing_files:,} (0%)"
-                
-            self.info_var.set(info_text)
-            
-            # Populate tree
-            self.populate_files_tree()
-            self.status_var.set(f"Loaded {total_files:,} files from index")
-            
+            # Everything the tree and the filter read, converted once rather than per row and keystroke.
+            # Sorted by path here, so filtered subsets come out in order without sorting again.
+            file_entries = sorted(file_index.iter_entries(), key=lambda entry: str(entry.path))
+            paths = [str(entry.path) for entry in file_entries]
+            lower_paths = [path.lower() for path in paths]  # Not always the same length as the path
+            lower_starts = [0]
+            for lower in lower_paths:
+                lower_starts.append(lower_starts[-1] + len(lower) + 1)
+            lower_blob = '\0'.join(lower_paths) + '\0'
+            columns = (paths,
+                       lower_paths,
+                       lower_blob,
+                       lower_starts,
+                       not any(c in lower_blob for c in _IGNORECASE_ONLY_FOLDS),
+                       [entry.path.name for entry in file_entries],
+                       array('q', (entry.size for entry in file_entries)),
+                       array('q', (entry.mtime for entry in file_entries)))
         except Exception as e:
-            self.info_var.set(f"Error loading index: {e}")
-            self.status_var.set("Failed to load index")
+            self._post(self._load_failed, e)
+            return
+        
+        self._post(self._load_done, columns)
+        
+        def check(path):
+            # Once the window is closed, the remaining checks finish without touching the disk
+            return not self._closed and path_is_native_and_exists(path)
+        
+        with ThreadPoolExecutor(max_workers=self.EXISTS_WORKERS) as executor:
+            exists = list(executor.map(check, (entry.path for entry in file_entries)))
+        self._post(self._exists_checked, exists)
+    
+    def _post(self, callback, *args):
+        """Hand a worker thread's result to the Tk thread, unless the window has gone."""
+        if self._closed:
+            return
+        try:
+            self.root.after(0, callback, *args)
+        except (tk.TclError, RuntimeError):
+            pass  # Window closed meanwhile
+    
+    def _load_failed(self, error: Exception):
+        self.info_var.set(f"Error loading index: {error}")
+        self.status_var.set("Failed to load index")
+    
+    def _load_done(self, columns):
+        """Show the loaded index; the existing count follows from the worker's next step."""
+        if self._closed:
+            return
+        (self._paths, self._paths_lower, self._lower_blob, self._lower_starts, self._blob_folds_ascii,
+         self._names, self._sizes, self._mtimes) = columns
+        
+        # Update info
+        total_files = len(self._paths)
+        total_size = sum(self._sizes)
+        self._info_prefix = f"Total files: {total_files:,} | Total size: {format_size(total_size)} | "
+        self.info_var.set(self._info_prefix + "Existing: checking...")
+        
+        # Populate tree, with whatever was typed into the filter while loading
+        filter_text = self.search_var.get().strip()
+        self.populate_files_tree(filter_text if filter_text else None)
+        self.status_var.set(f"Loaded {total_files:,} files from index")
+    
+    def _exists_checked(self, exists: List[bool]):
+        """Show the existence check's results in the info line and the loaded rows."""
+        if self._closed:
+            return
+        self._exists = exists
+        total_files = len(exists)
+        existing_files = sum(exists)
+        
+        # Fix division by zero error
+        if total_files > 0:
+            percentage = existing_files/total_files*100
+            self.info_var.set(self._info_prefix + f"Existing: {existing_files:,} ({percentage:.1f}%)")
+        else:
+            self.info_var.set(self._info_prefix + f"Existing: {existing_files:,} (0%)")
+        
+        for index in self.rows_shown[:self._rows_loaded]:
+            _, values, tags = self._row_for(index)
+            self.files_tree.item(str(index), values=values, tags=tags)
     
     def populate_files_tree(self, filter_text=None):
-        """Populate the files tree with optional filtering."""
+        """
+        Populate the files tree with optional filtering. Only the first
+        BROWSE_CHUNK rows are inserted; _on_tree_scroll adds more on demand.
+        """
+        self._shown_filter = filter_text or ''
+        
         # Clear existing items
-        for item in self.files_tree.get_children():
-            self.files_tree.delete(item)
+        self.files_tree.delete(*self.files_tree.get_children())
         
         # Apply filter
-        entries_to_show = self.file_entries
+        names, paths = self._names, self._paths
+        rows_to_show = list(range(len(paths)))
         if filter_text:
-            try:
-                pattern = re.compile(filter_text, re.IGNORECASE)
-                entries_to_show = [entry for entry in self.file_entries 
-                                if pattern.search(entry.path.name) or pattern.search(str(entry.path))]
-            except re.error:
-                entries_to_show = [entry for entry in self.file_entries 
-                                if filter_text.lower() in entry.path.name.lower() or 
-                                    filter_text.lower() in str(entry.path).lower()]
-        
-        # Sort by path
-        entries_to_show.sort(key=lambda x: str(x.path))
-        
-        # Populate tree
-        for entry in entries_to_show:
-            filename = entry.path.name
-            size_str = format_size(entry.size)
-            modified_str = dt.fromtimestamp(entry.mtime).strftime('%Y-%m-%d %H:%M')
-            
-            # Clean up path display - show relative path from home
-            try:
-                # Convert to concrete Path for display
-                display_path = str(Path(entry.path).parent)
-                
-                # Try to make it relative to home for cleaner display
-                home_path = Path.home()
-                try:
-                    if Path(entry.path).is_relative_to(home_path):
-                        display_path = "~/" + str(Path(entry.path).parent.relative_to(home_path))
-                except (ValueError, OSError, AttributeError):
-                    pass  # Keep the full path
-                    
-            except (ValueError, OSError):
-                display_path = str(entry.path.parent)
-            
-            # Check if file exists (but don't let it crash if path conversion fails)
-            try:
-                exists = path_is_native_and_exists(entry.path)
-                exists_str = "Yes" if exists else "No"
-                tags = ('exists',) if exists else ('missing',)
-            except:
-                exists_str = "Unknown"
-                tags = ('missing',)
-            
-            self.files_tree.insert('', 'end',
-                                text=filename,
-                                values=(size_str, modified_str, display_path, exists_str),
-                                tags=tags)
+            pattern = _compile_filter(filter_text)
+            if pattern is None:
+                # Not a valid regex: plain case-insensitive substring match
+                rows_to_show = self._substring_rows(filter_text.lower())
+            else:
+                candidates = self._candidate_rows(filter_text)
+                if _NAME_ANCHORED_RE.search(filter_text):
+                    rows_to_show = [index for index in candidates
+                                    if pattern.search(names[index]) or pattern.search(paths[index])]
+                else:
+                    search = pattern.search
+                    rows_to_show = [index for index in candidates if search(paths[index])]
         
-        # Configure tag colors
-        self.files_tree.tag_configure('missing', foreground='gray')
-        # we may just use the system default which should adjust to light or dark mode
-        # self.files_tree.tag_configure('exists', foreground='black')
+        # Populate tree (already in path order, see load_index_contents)
+        self.rows_shown = rows_to_show
+        self._rows_loaded = 0
+        self._load_more_rows()
+        
+        self.status_var.set(f"Showing {len(rows_to_show):,} of {len(self._paths):,} files")
+        
+    def _candidate_rows(self, filter_text: str):
+        """
+        Row indexes, in order, that a regex filter still has to test: only
+        paths holding the literal text every match needs can match (a name
+        is the tail of its path), and the blob scan finds those without
+        running the regex on every row.
+        """
+        literal = required_literal(filter_text)
+        if len(literal) < 2 or not literal.isascii() or not self._blob_folds_ascii:
+            return range(len(self._paths))
+        return self._substring_rows(literal)
+    
+    def _substring_rows(self, needle: str) -> List[int]:
+        """Indexes, in order, of the rows whose lowercased path contains needle."""
+        paths_lower = self._paths_lower
+        if '\0' in needle:
+            return [index for index, lower in enumerate(paths_lower) if needle in lower]
+        
+        # Jump from match to match, then on to the start of the following path.
+        # A jump costs several row tests, so past an eighth of the rows matching, test the rest in turn.
+        starts = self._lower_starts
+        find = self._lower_blob.find
+        rows = []
+        position = find(needle)
+        while position >= 0:
+            index = bisect_right(starts, position) - 1
+            rows.append(index)
+            if len(rows) * 8 > len(paths_lower):
+                rows.extend(i for i in range(index + 1, len(paths_lower)) if needle in paths_lower[i])
+                break
+            position = find(needle, starts[index + 1])
+        return rows
+    
+    def _row_for(self, index: int):
+        """Return (filename, column values, tags) for the tree row of the index'th entry."""
+        filename = self._names[index]
+        size_str = format_size(self._sizes[index])
+        modified_str = format_mtime(self._mtimes[index])
         
-        self.status_var.set(f"Showing {len(entries_to_show):,} of {len(self.file_entries):,} files")
+        # Show the folder, relative to home where possible; plain string tests, no Path objects per row
+        display_path = os.path.dirname(self._paths[index]) or '.'
+        home = self._home
+        if display_path == home:
+            display_path = "~"
+        elif display_path.startswith(home) and display_path[len(home)] == os.sep:
+            display_path = "~/" + display_path[len(home) + 1:]
         
+        # Existence comes from the background check; "…" until it is done
+        if self._exists is None:
+            exists_str = "…"
+            tags = ()
+        else:
+            exists = self._exists[index]
+            exists_str = "Yes" if exists else "No"
+            tags = ('exists',) if exists else ('missing',)
+        
+        return filename, (size_str, modified_str, display_path, exists_str), tags
+    
+    def _load_more_rows(self):
+        """Insert the next BROWSE_CHUNK rows of rows_shown into the tree."""
+        self._load_pending = False
+        start = self._rows_loaded
+        end = min(start + self.BROWSE_CHUNK, len(self.rows_shown))
+        for index in self.rows_shown[start:end]:
+            filename, values, tags = self._row_for(index)
+            self.files_tree.insert('', 'end', iid=str(index), text=filename, values=values, tags=tags)
+        self._rows_loaded = end
+    
+    def _on_tree_scroll(self, first, last):
+        """Update the scrollbar, and load more rows once the view nears the end of those loaded."""
+        self.v_scrollbar.set(first, last)
+        if float(last) > 0.9 and self._rows_loaded < len(self.rows_shown) and not self._load_pending:
+            # Not from inside Tk's scroll callback
+            self._load_pending = True
+            self.root.after_idle(self._load_more_rows)
+    
     def on_search_change(self, event):
-        """Handle search text changes."""
+        """Coalesce a burst of search keystrokes into a single filter pass."""
+        self._cancel_pending_filter()
+        self._pending_filter = self.root.after(self.FILTER_DEBOUNCE_MS, self.apply_filter)
+    
+    def _cancel_pending_filter(self):
+        if self._pending_filter is not None:
+            self.root.after_cancel(self._pending_filter)
+            self._pending_filter = None
+    
+    def apply_filter(self):
+        """Apply the current search text to the files tree."""
+        self._pending_filter = None
         filter_text = self.search_var.get().strip()
+        if filter_text == self._shown_filter:
+            return  # e.g. only Shift or an arrow key was released
         self.populate_files_tree(filter_text if filter_text else None)
     
     def clear_search(self):
         """Clear search filter."""
+        self._cancel_pending_filter()
         self.search_var.set("")
-        self.populate_files_tree()
+        if self._shown_filter:
+            self.populate_files_tree()
+    
+    def _selected_index(self) -> Optional[int]:
+        """Column index of the selected row, from its iid; None if nothing is selected."""
+        selection = self.files_tree.selection()
+        return int(selection[0]) if selection else None
     
     def on_file_double_click(self, event):
         """Handle double-click on file with error handling."""
-        selection = self.files_tree.selection()
-        if selection:
-            item = selection[0]
-            path_str = self.files_tree.item(item, 'values')[2]
-            path = Path(path_str)
+        index = self._selected_index()
+        if index is not None:
+            path = Path(self._paths[index])
             
             try:
                 open_file_or_folder(path, open_folder=False)
@@ -245,42 +429,32 @@ class IndexBrowserWindow:
         """Handle right-click context menu."""
         selection = self.files_tree.selection()
         if selection:
-            menu = tk.Menu(self.root, tearoff=0)
-            menu.add_command(label="Copy Path", command=self.copy_selected_path)
-            menu.add_command(label="Copy Filename", command=self.copy_selected_filename)
-            menu.add_command(label="Show in Folder", command=self.show_in_folder)
             try:
-                menu.tk_popup(event.x_root, event.y_root)
+                self.context_menu.tk_popup(event.x_root, event.y_root)
             finally:
-                menu.grab_release()
+                self.context_menu.grab_release()
     
     def copy_selected_path(self):
         """Copy selected file path to clipboard."""
-        selection = self.files_tree.selection()
-        if selection:
-            item = selection[0]
-            path_str = self.files_tree.item(item, 'values')[2]
+        index = self._selected_index()
+        if index is not None:
             self.root.clipboard_clear()
-            self.root.clipboard_append(path_str)
+            self.root.clipboard_append(self._paths[index])
             self.status_var.set("Path copied to clipboard")
     
     def copy_selected_filename(self):
         """Copy selected filename to clipboard."""
-        selection = self.files_tree.selection()
-        if selection:
-            item = selection[0]
-            filename = self.files_tree.item(item, 'text')
+        index = self._selected_index()
+        if index is not None:
             self.root.clipboard_clear()
-            self.root.clipboard_append(filename)
+            self.root.clipboard_append(self._names[index])
             self.status_var.set("Filename copied to clipboard")
     
     def show_in_folder(self):
         """Show selected file in folder if it exists with error handling."""
-        selection = self.files_tree.selection()
-        if selection:
-            item = selection[0]
-            path_str = self.files_tree.item(item, 'values')[2]
-            path = Path(path_str)
+        index = self._selected_index()
+        if index is not None:
+            path = Path(self._paths[index])
             
             try:
                 open_file_or_folder(path, open_folder=True)
@@ -299,16 +473,21 @@ class IndexBrowserWindow:
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write("Filename,Size,Size (bytes),Modified,Full Path,Exists\n")
+                with open(filename, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC)
+                    writer.writerow(["Filename", "Size", "Size (bytes)", "Modified", "Full Path", "Exists"])
                     
-                    for item in self.files_tree.get_children():
-                        text = self.files_tree.item(item, 'text').replace('"', '""')
-                        values = [str(v).replace('"', '""') for v in self.files_tree.item(item, 'values')]
-                        size_bytes = next((entry.size for entry in self.file_entries 
-                                         if str(entry.path) == values[2]), 0)
-                        
-                        f.write(f'"{text}","{values[0]}",{size_bytes},"{values[1]}","{values[2]}","{values[3]}"\n')
+                    # From the columns, not the tree: it only holds the rows loaded so far
+                    exists = self._exists
+                    writer.writerows(
+                        (self._names[index],
+                         format_size(self._sizes[index]),
+                         self._sizes[index],
+                         format_mtime(self._mtimes[index]),
+                         self._paths[index],
+                         "…" if exists is None else ("Yes" if exists[index] else "No"))
+                        for index in self.rows_shown
+                    )
                 
                 messagebox.showinfo("Success", f"File list exported to:\n{filename}")
                 
@@ -317,6 +496,8 @@ class IndexBrowserWindow:
     
     def close(self):
         """Close the browser window."""
+        self._closed = True
+        self._cancel_pending_filter()
         self.root.destroy()
     
     def run(self):
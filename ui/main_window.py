@@ -5,14 +5,18 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
 from typing import List, Optional, Set, Dict
+import os
 import re
+import csv
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime as dt
 
 # Import all required modules with absolute imports
 from core.config import Config
 from core.index_discovery import IndexDiscovery
 from core.data_structures import SearchCriteria, SearchResult, ScanConfig
-from core.search_logic import search_files_in_index
+from core.search_logic import search_files_in_index, compile_name_pattern, get_name_matcher, get_mtime_bounds, filter_entries
 from core.file_index import FileIndex
 from core.scan_operations import run_scan_with_progress_enhanced, run_scan_with_progress
 from utils.i18n import translator as t
@@ -22,11 +26,23 @@ from ui.progress_window import ProgressWindow
 from ui.duplicate_results import DuplicateResultsWindow
 from ui.index_browser import IndexBrowserWindow
 from ui.dialogs import IndexCreationDialog
-from utils.file_utils import format_size, parse_size, parse_date, get_display_path
+from utils.file_utils import (format_size, parse_size, parse_date, get_display_path, hash_algo_from_index_name,
+                              HASH_ALGORITHMS, find_missing_paths, format_mtime, format_mtime_iso)
 
 class UniversalSearchApp:
     """Main application with tabbed interface."""
     
+    # Rows inserted into a Treeview before yielding to Tk for a redraw
+    TREE_INSERT_BATCH = 500
+    # Write buffer for CSV exports, so large exports issue few write() syscalls
+    EXPORT_BUFFER_SIZE = 1 << 20
+    # Concurrent CAF header reads when listing indices
+    INDEX_INFO_WORKERS = 8
+    # Quiet period after the last criteria edit before a search-as-you-type run
+    SEARCH_DEBOUNCE_MS = 200
+    # Seconds to wait for folder existence checks before reporting them as hung
+    PATH_CHECK_TIMEOUT = 2.0
+    
     def __init__(self):
         self.config = Config()
         
@@ -51,10 +67,22 @@ class UniversalSearchApp:
         self.index_discovery = IndexDiscovery(self.config)
         self.available_indices = []
         self.search_results = []
+        # Tree column values per result (size, modified, index, folder),
+        # formatted once on insert and reused by export
+        self.search_result_rows = []
+        # Tree item id -> object lookups, so event handlers never re-parse tags
+        self._iid_to_caf: Dict[str, Path] = {}
+        self._iid_to_result: Dict[str, SearchResult] = {}
+        # Pending debounced search (Tk after id), see _schedule_search
+        self._pending_search = None
+        # Set to abandon the debounced search that is running, see _run_live_search
+        self._live_search_cancel: Optional[threading.Event] = None
         
         # Duplicate scan variables
         self.dup_source_path = None
         self.dup_dest_paths = []
+        # Mirror of dup_dest_paths for O(1) duplicate checks; the list keeps order
+        self._dup_dest_set = set()
         
         self.setup_ui()
         
@@ -102,7 +130,7 @@ class UniversalSearchApp:
 
     def toggle_index_active(self, item):
         """Toggle active state of an index."""
-        caf_path_str = self.index_tree.item(item, 'tags')[0]
+        caf_path_str = str(self._iid_to_caf[item])
         current_active = self.config.is_index_active(caf_path_str)
         
         # Toggle state
@@ -115,32 +143,32 @@ class UniversalSearchApp:
         self.index_tree.item(item, values=current_values)
         
         # Update tags
-        new_tags = (caf_path_str, 'inactive' if current_active else 'active')
+        new_tags = ('inactive' if current_active else 'active',)
         self.index_tree.item(item, tags=new_tags)
 
     def activate_all_indices(self):
         """Activate all indices."""
         for item in self.index_tree.get_children():
-            caf_path_str = self.index_tree.item(item, 'tags')[0]
+            caf_path_str = str(self._iid_to_caf[item])
             self.config.set_index_active(caf_path_str, True)
             
             # Update display
             current_values = list(self.index_tree.item(item, 'values'))
             current_values[0] = "☑"
-            self.index_tree.item(item, values=current_values, tags=(caf_path_str, 'active'))
+            self.index_tree.item(item, values=current_values, tags=('active',))
         
         self.config.save_config()
 
     def deactivate_all_indices(self):
         """Deactivate all indices."""
         for item in self.index_tree.get_children():
-            caf_path_str = self.index_tree.item(item, 'tags')[0]
+            caf_path_str = str(self._iid_to_caf[item])
             self.config.set_index_active(caf_path_str, False)
             
             # Update display
             current_values = list(self.index_tree.item(item, 'values'))
             current_values[0] = "☐"
-            self.index_tree.item(item, values=current_values, tags=(caf_path_str, 'inactive'))
+            self.index_tree.item(item, values=current_values, tags=('inactive',))
         
         self.config.save_config()
 
@@ -156,9 +184,7 @@ class UniversalSearchApp:
             messagebox.showwarning("No Selection", "Please select an index to browse.")
             return
         
-        item = selection[0]
-        caf_path_str = self.index_tree.item(item, 'tags')[0]
-        caf_path = Path(caf_path_str)
+        caf_path = self._iid_to_caf[selection[0]]
         
         # Launch index browser
         browser = IndexBrowserWindow(self.root, caf_path)
@@ -216,6 +242,15 @@ class UniversalSearchApp:
         search_btn_frame.pack(fill=tk.X, pady=(10, 0))
         ttk.Button(search_btn_frame, text=t.get('search_button'), command=self.perform_search).pack(side=tk.LEFT)
         ttk.Button(search_btn_frame, text=t.get('clear_button'), command=self.clear_search_criteria).pack(side=tk.LEFT, padx=(10, 0))
+        self.search_as_you_type_var = tk.BooleanVar(value=self.config.get('search_as_you_type', False))
+        ttk.Checkbutton(search_btn_frame, text=t.get('search_as_you_type'),
+                        variable=self.search_as_you_type_var,
+                        command=self.on_search_as_you_type_toggle).pack(side=tk.LEFT, padx=(20, 0))
+        
+        # Re-run the search when criteria change (debounced, opt-in)
+        for var in (self.search_name_var, self.search_size_min_var, self.search_size_max_var,
+                    self.search_date_min_var, self.search_date_max_var):
+            var.trace_add('write', self._schedule_search)
         
         # Results frame
         results_frame = ttk.LabelFrame(main_frame, text=t.get('search_results'), padding=10)
@@ -228,17 +263,13 @@ class UniversalSearchApp:
         columns = (t.get('size_col'), t.get('modified_col'), t.get('index_col'), t.get('path_col'))  # Added index_col
         self.search_tree = ttk.Treeview(tree_frame, columns=columns, show='tree headings')
         self.search_tree.heading('#0', text=t.get('filename_col'))
-        self.search_tree.heading(t.get('size_col'), text=t.get('size_col'))
-        self.search_tree.heading(t.get('modified_col'), text=t.get('modified_col'))
-        self.search_tree.heading(t.get('index_col'), text=t.get('index_col'))
-        self.search_tree.heading(t.get('path_col'), text=t.get('path_col'))
+        for col in columns:
+            self.search_tree.heading(col, text=col)
         
         # Column widths
         self.search_tree.column('#0', width=200, minwidth=150)
-        self.search_tree.column(t.get('size_col'), width=80, minwidth=60)
-        self.search_tree.column(t.get('modified_col'), width=120, minwidth=100)
-        self.search_tree.column(t.get('index_col'), width=150, minwidth=120)
-        self.search_tree.column(t.get('path_col'), width=300, minwidth=200)
+        for col, (width, minwidth) in zip(columns, ((80, 60), (120, 100), (150, 120), (300, 200))):
+            self.search_tree.column(col, width=width, minwidth=minwidth)
         
         # Scrollbars
         v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.search_tree.yview)
@@ -253,6 +284,12 @@ class UniversalSearchApp:
         self.search_tree.bind('<Double-Button-1>', self.on_search_double_click)
         self.search_tree.bind('<Button-3>', self.on_search_right_click)
         
+        # Context menu, built once and popped up on each right-click
+        self.search_menu = tk.Menu(self.root, tearoff=0)
+        self.search_menu.add_command(label=t.get('open_file'), command=self.open_search_file)
+        self.search_menu.add_command(label=t.get('open_folder'), command=self.open_search_folder)
+        self.search_menu.add_command(label=t.get('copy_path'), command=self.copy_search_path)
+        
         # Action buttons
         action_frame = ttk.Frame(results_frame)
         action_frame.pack(fill=tk.X, pady=(10, 0))
@@ -406,9 +443,19 @@ class UniversalSearchApp:
         
         self.dup_hash_algo_var = tk.StringVar(value=self.config.get('default_hash_algo', 'md5'))
         self.dup_hash_combo = ttk.Combobox(hash_frame, textvariable=self.dup_hash_algo_var, 
-                                        values=["md5", "sha1", "sha256"], width=10, state="readonly")
+                                        values=HASH_ALGORITHMS, width=10, state="readonly")
         self.dup_hash_combo.pack(side=tk.LEFT, padx=(10, 0))
         
+        self.dup_skip_unambiguous_var = tk.BooleanVar(value=False)
+        self.dup_skip_unambiguous_check = ttk.Checkbutton(hash_frame, text=t.get('skip_hash_unambiguous'),
+                                                          variable=self.dup_skip_unambiguous_var)
+        self.dup_skip_unambiguous_check.pack(side=tk.LEFT, padx=(10, 0))
+        
+        self.dup_verify_var = tk.BooleanVar(value=False)
+        self.dup_verify_check = ttk.Checkbutton(hash_frame, text=t.get('verify_contents'),
+                                                variable=self.dup_verify_var, state="disabled")
+        self.dup_verify_check.pack(side=tk.LEFT, padx=(10, 0))
+        
         # Index options
         index_frame = ttk.Frame(options_frame)
         index_frame.pack(fill=tk.X)
@@ -446,7 +493,7 @@ class UniversalSearchApp:
         
         self.hash_var = tk.StringVar(value=self.config.get('default_hash_algo', 'md5'))
         hash_combo = ttk.Combobox(hash_frame, textvariable=self.hash_var,
-                                 values=['md5', 'sha1', 'sha256'], width=10, state='readonly')
+                                 values=HASH_ALGORITHMS, width=10, state='readonly')
         hash_combo.pack(side=tk.LEFT)
         
         # Auto-load indices
@@ -485,6 +532,7 @@ class UniversalSearchApp:
     
     def refresh_indices(self):
         """Refresh the list of available indices."""
+        FileIndex.clear_load_cache()
         self.available_indices = self.index_discovery.discover_indices()
         self.populate_index_tree()
         self.update_status()
@@ -492,26 +540,31 @@ class UniversalSearchApp:
     def populate_index_tree(self):
         """Populate the index management tree with active states."""
         # Clear existing items
-        for item in self.index_tree.get_children():
-            self.index_tree.delete(item)
-        
-        for caf_path in self.available_indices:
-            info = self.index_discovery.get_index_info(caf_path)
-            if info:
-                is_active = self.config.is_index_active(str(caf_path))
-                active_text = "☑" if is_active else "☐"
-                
-                self.index_tree.insert('', 'end',
-                                    text=caf_path.name,
-                                    values=(
-                                        active_text,
-                                        str(info.root_path),
-                                        f"{info.file_count:,}",
-                                        format_size(info.total_size),
-                                        info.created_date.strftime('%Y-%m-%d'),
-                                        info.hash_method
-                                    ),
-                                    tags=(str(caf_path), 'active' if is_active else 'inactive'))
+        self.index_tree.delete(*self.index_tree.get_children())
+        self._iid_to_caf.clear()
+        
+        # Read all headers before touching the tree so rows go in as one batch.
+        # Header reads are I/O bound (slow on NAS / cold disks), so overlap them.
+        with ThreadPoolExecutor(max_workers=self.INDEX_INFO_WORKERS) as executor:
+            infos = list(executor.map(self.index_discovery.get_index_info, self.available_indices))
+        rows = [(caf_path, info) for caf_path, info in zip(self.available_indices, infos) if info]
+        
+        for caf_path, info in rows:
+            is_active = self.config.is_index_active(str(caf_path))
+            active_text = "☑" if is_active else "☐"
+            
+            iid = self.index_tree.insert('', 'end',
+                                text=caf_path.name,
+                                values=(
+                                    active_text,
+                                    str(info.root_path),
+                                    f"{info.file_count:,}",
+                                    format_size(info.total_size),
+                                    info.created_date.strftime('%Y-%m-%d'),
+                                    info.hash_method
+                                ),
+                                tags=('active' if is_active else 'inactive',))
+            self._iid_to_caf[iid] = caf_path
                 
     def add_dup_dest_folder_enhanced(self):
         """Add destination folder with index detection."""
@@ -520,10 +573,9 @@ class UniversalSearchApp:
             folder_path = Path(folder)
             
             # Check if folder already exists
-            for item in self.dup_dest_tree.get_children():
-                if self.dup_dest_tree.item(item, 'text') == str(folder_path):
-                    messagebox.showwarning("Warning", t.get('duplicate_folder'))
-                    return
+            if folder_path in self._dup_dest_set:
+                messagebox.showwarning("Warning", t.get('duplicate_folder'))
+                return
             
             # Find related indices
             related_indices = self.find_indices_for_folder(folder_path)
@@ -560,6 +612,7 @@ class UniversalSearchApp:
                                                 tags=('dest_folder', str(folder_path)))
             
             self.dup_dest_paths.append(folder_path)
+            self._dup_dest_set.add(folder_path)
 
     def find_indices_for_folder(self, folder_path: Path) -> List[Dict]:
         """Find all active indices that contain the given folder."""
@@ -665,7 +718,8 @@ class UniversalSearchApp:
             for item in selection:
                 folder_path = Path(self.dup_dest_tree.item(item, 'text'))
                 self.dup_dest_tree.delete(item)
-                if folder_path in self.dup_dest_paths:
+                if folder_path in self._dup_dest_set:
+                    self._dup_dest_set.discard(folder_path)
                     self.dup_dest_paths.remove(folder_path)
 
     def clear_dup_dest_folders_enhanced(self):
@@ -673,6 +727,7 @@ class UniversalSearchApp:
         for item in self.dup_dest_tree.get_children():
             self.dup_dest_tree.delete(item)
         self.dup_dest_paths.clear()
+        self._dup_dest_set.clear()
 
     def clear_duplicate_form_enhanced(self):
         """Clear the enhanced duplicate detection form."""
@@ -688,10 +743,13 @@ class UniversalSearchApp:
 
     def perform_search(self):
         """Perform file search across only active indices with progress window."""
+        self._cancel_live_search()
         try:
             criteria = self.parse_search_criteria()
             self.search_tree.delete(*self.search_tree.get_children())
             self.search_results.clear()
+            self.search_result_rows.clear()
+            self._iid_to_result.clear()
             
             # Get only active indices
             active_indices = self.get_active_indices_only()
@@ -712,6 +770,8 @@ class UniversalSearchApp:
             criteria = self.parse_search_criteria()
             self.search_tree.delete(*self.search_tree.get_children())
             self.search_results.clear()
+            self.search_result_rows.clear()
+            self._iid_to_result.clear()
             
             # Get only active indices
             active_indices = self.get_active_indices_only()
@@ -746,8 +806,7 @@ class UniversalSearchApp:
                             index_name = "Unknown"
                         
                         # Add results with clean index name
-                        for result in results:
-                            self.add_search_result_to_tree(result, index_name)
+                        self.add_search_results_to_tree(results, index_name)
             
             self.status_var.set(t.get('found_status', total_results))
             
@@ -756,11 +815,97 @@ class UniversalSearchApp:
             self.status_var.set("Search failed")
 
     
+    def on_search_as_you_type_toggle(self):
+        """Persist the search-as-you-type setting."""
+        self.config.set('search_as_you_type', self.search_as_you_type_var.get())
+        self.config.save_config()
+        if self.search_as_you_type_var.get():
+            self._schedule_search()
+    
+    def _schedule_search(self, *args):
+        """Coalesce a burst of criteria edits into a single search."""
+        if not self.search_as_you_type_var.get():
+            return
+        self._cancel_live_search()
+        if self._pending_search is not None:
+            self.root.after_cancel(self._pending_search)
+        self._pending_search = self.root.after(self.SEARCH_DEBOUNCE_MS, self._run_scheduled_search)
+    
+    def _run_scheduled_search(self):
+        """Run a debounced search, silently skipping incomplete or empty criteria."""
+        self._pending_search = None
+        try:
+            criteria = self.parse_search_criteria()
+        except ValueError:
+            return  # Still typing (half-written regex, size or date)
+        
+        if (criteria.name_pattern is None and criteria.size_min is None and criteria.size_max is None
+                and criteria.date_min is None and criteria.date_max is None):
+            return
+        active_indices = self.get_active_indices_only()
+        if not active_indices:
+            return
+        self._run_live_search(criteria, active_indices)
+    
+    def _cancel_live_search(self):
+        if self._live_search_cancel is not None:
+            self._live_search_cancel.set()
+            self._live_search_cancel = None
+    
+    def _run_live_search(self, criteria: SearchCriteria, active_indices: List[Path]):
+        """
+        Search in the background without the modal progress window, so typing
+        carries on; results and status arrive through root.after. The search
+        is abandoned as soon as the criteria change again.
+        """
+        cancel = threading.Event()
+        self._live_search_cancel = cancel
+        
+        self.search_tree.delete(*self.search_tree.get_children())
+        self.search_results.clear()
+        self.search_result_rows.clear()
+        self._iid_to_result.clear()
+        self.status_var.set(t.get('searching_status'))
+        
+        def post(callback, *args):
+            def run():
+                if not cancel.is_set():
+                    callback(*args)
+            try:
+                self.root.after(0, run)
+            except (tk.TclError, RuntimeError):
+                pass  # Main window closed meanwhile
+        
+        def search_thread():
+            total_results = 0
+            try:
+                max_workers = min(len(active_indices), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [executor.submit(self._search_one_index, caf_path, criteria,
+                                               lambda operation, details: None, cancel)
+                               for caf_path in active_indices]
+                    # In index order, so results (and their CSV export) keep the same order every run
+                    for future in futures:
+                        index_name, results = future.result()
+                        if cancel.is_set():
+                            return
+                        if results:
+                            post(self.add_search_results_to_tree, results, index_name)
+                        total_results += len(results)
+                post(self.status_var.set, t.get('found_status', total_results))
+            except Exception as e:
+                post(self.status_var.set, t.get('search_error', str(e)))
+        
+        threading.Thread(target=search_thread, daemon=True).start()
+    
     def parse_search_criteria(self) -> SearchCriteria:
         """Parse search criteria from UI."""
         # Name pattern
         name_pattern = self.search_name_var.get().strip()
-        if not name_pattern:
+        name_matcher = None
+        if name_pattern:
+            name_matcher = compile_name_pattern(name_pattern).search
+        else:
             name_pattern = None
         
         # Size range  
@@ -790,7 +935,8 @@ class UniversalSearchApp:
             size_min=size_min,
             size_max=size_max,
             date_min=date_min,
-            date_max=date_max
+            date_max=date_max,
+            name_matcher=name_matcher
         )
     
     def load_index_for_search(self, caf_path: Path):
@@ -798,18 +944,12 @@ class UniversalSearchApp:
         print(f"[LOAD] Loading index: {caf_path}")
         
         # Determine hash algorithm from filename
-        name = caf_path.stem.lower()
-        use_hash = True
-        if '_sha256' in name:
-            hash_algo = 'sha256'
-        elif '_sha1' in name:
-            hash_algo = 'sha1'
-        else:
-            hash_algo = 'md5'
+        hash_algo = hash_algo_from_index_name(caf_path)
         
         print(f"[LOAD] Using hash algorithm: {hash_algo}")
         
-        file_index = FileIndex.load_from_caf(caf_path, use_hash, hash_algo)
+        # Cached by path/mtime/size, so a rewritten index is never served stale
+        file_index = FileIndex.load_from_caf_cached(caf_path, True, hash_algo)
         
         if file_index:
             print(f"[LOAD] Successfully loaded index with {file_index.total_files} files")
@@ -829,24 +969,33 @@ class UniversalSearchApp:
         
         return file_index
     
+    def add_search_results_to_tree(self, results: List[SearchResult], index_name: str = ""):
+        """Add a batch of search results, letting Tk redraw once per TREE_INSERT_BATCH rows."""
+        batch = self.TREE_INSERT_BATCH
+        for start in range(0, len(results), batch):
+            for result in results[start:start + batch]:
+                self.add_search_result_to_tree(result, index_name)
+            self.root.update_idletasks()
+    
     def add_search_result_to_tree(self, result: SearchResult, index_name: str = ""):
         """Add search result to tree with FULL ABSOLUTE path display."""
         self.search_results.append(result)
-        filename = result.path.name
-        size_str = format_size(result.size)
-        modified_str = dt.fromtimestamp(result.mtime).strftime('%Y-%m-%d %H:%M')
-        
-        # Show the COMPLETE absolute path - no shortening!
-        display_path = str(result.path.parent)
         
         # Ensure we have a valid index name
         if not index_name or index_name.strip() == "":
             index_name = "Unknown"
         
-        self.search_tree.insert('', 'end',
-                            text=filename,
-                            values=(size_str, modified_str, index_name, display_path),
-                            tags=(len(self.search_results) - 1,))
+        # Show the COMPLETE absolute path - no shortening!
+        row = (format_size(result.size),
+               format_mtime(result.mtime),
+               index_name,
+               str(result.path.parent))
+        self.search_result_rows.append(row)
+        
+        iid = self.search_tree.insert('', 'end',
+                            text=result.path.name,
+                            values=row)
+        self._iid_to_result[iid] = result
     
     def clear_search_criteria(self):
         """Clear all search criteria."""
@@ -862,15 +1011,7 @@ class UniversalSearchApp:
         if not selection:
             return None
             
-        item = selection[0]
-        tags = self.search_tree.item(item, 'tags')
-        if tags:
-            try:
-                result_index = int(tags[0])
-                return self.search_results[result_index]
-            except (ValueError, IndexError):
-                return None
-        return None
+        return self._iid_to_result.get(selection[0])
     
     def on_search_double_click(self, event):
         """Handle double-click on search result."""
@@ -886,14 +1027,10 @@ class UniversalSearchApp:
         """Handle right-click on search result."""
         result = self.get_selected_search_result()
         if result:
-            menu = tk.Menu(self.root, tearoff=0)
-            menu.add_command(label=t.get('open_file'), command=self.open_search_file)
-            menu.add_command(label=t.get('open_folder'), command=self.open_search_folder)
-            menu.add_command(label=t.get('copy_path'), command=self.copy_search_path)
             try:
-                menu.tk_popup(event.x_root, event.y_root)
+                self.search_menu.tk_popup(event.x_root, event.y_root)
             finally:
-                menu.grab_release()
+                self.search_menu.grab_release()
     
     def open_search_file(self):
         """Open selected search result file with error handling."""
@@ -940,24 +1077,19 @@ class UniversalSearchApp:
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write("Filename,Size,Size (bytes),Modified,Index,Full Path\n")
-                    for i, result in enumerate(self.search_results):
-                        # Get the tree item to extract index information
-                        tree_children = list(self.search_tree.get_children())
-                        if i < len(tree_children):
-                            item = tree_children[i]
-                            values = self.search_tree.item(item, 'values')
-                            index_name = values[2] if len(values) > 2 else ""
-                        else:
-                            index_name = ""
-                        
-                        filename_clean = result.path.name.replace('"', '""')
-                        path_clean = str(result.path).replace('"', '""')
-                        size_str = format_size(result.size)
-                        modified_str = dt.fromtimestamp(result.mtime).strftime('%Y-%m-%d %H:%M:%S')
-                        
-                        f.write(f'"{filename_clean}","{size_str}",{result.size},"{modified_str}","{index_name}","{path_clean}"\n')
+                with open(filename, 'w', encoding='utf-8', newline='',
+                          buffering=self.EXPORT_BUFFER_SIZE) as f:
+                    writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC)
+                    writer.writerow(["Filename", "Size", "Size (bytes)", "Modified", "Index", "Full Path"])
+                    writer.writerows(
+                        (result.path.name,
+                         size_str,
+                         result.size,
+                         format_mtime_iso(result.mtime, ' '),
+                         index_name,
+                         str(result.path))
+                        for result, (size_str, _, index_name, _) in zip(self.search_results, self.search_result_rows)
+                    )
                 
                 messagebox.showinfo("Success", t.get('export_complete', filename))
                 
@@ -968,9 +1100,7 @@ class UniversalSearchApp:
         """Handle index selection in management tab."""
         selection = self.index_tree.selection()
         if selection:
-            item = selection[0]
-            caf_path_str = self.index_tree.item(item, 'tags')[0]
-            caf_path = Path(caf_path_str)
+            caf_path = self._iid_to_caf[selection[0]]
             
             info = self.index_discovery.get_index_info(caf_path)
             if info:
@@ -987,9 +1117,7 @@ class UniversalSearchApp:
         """Handle double-click on index - open in file manager with error handling."""
         selection = self.index_tree.selection()
         if selection:
-            item = selection[0]
-            caf_path_str = self.index_tree.item(item, 'tags')[0]
-            caf_path = Path(caf_path_str)
+            caf_path = self._iid_to_caf[selection[0]]
             try:
                 open_file_or_folder(caf_path, open_folder=True)
             except FileNotFoundError:
@@ -1012,12 +1140,11 @@ class UniversalSearchApp:
         """Delete selected index file."""
         selection = self.index_tree.selection()
         if selection:
-            item = selection[0]
-            caf_path_str = self.index_tree.item(item, 'tags')[0]
+            caf_path = self._iid_to_caf[selection[0]]
             
-            if messagebox.askyesno("Confirm", f"Delete index file?\n{Path(caf_path_str).name}"):
+            if messagebox.askyesno("Confirm", f"Delete index file?\n{caf_path.name}"):
                 try:
-                    Path(caf_path_str).unlink()
+                    caf_path.unlink()
                     self.refresh_indices()
                     messagebox.showinfo("Success", "Index file deleted successfully.")
                 except Exception as e:
@@ -1034,34 +1161,26 @@ class UniversalSearchApp:
     
     def add_dup_dest_folder(self):
         """Add destination folder for duplicate detection."""
-        folder = filedialog.askdirectory(title="Select Destination Folder")
-        if folder:
-            folder_path = Path(folder)
-            if folder_path not in self.dup_dest_paths:
-                self.dup_dest_paths.append(folder_path)
-                self.dup_dest_listbox.insert(tk.END, str(folder_path))
-            else:
-                messagebox.showwarning("Warning", t.get('duplicate_folder'))
+        self.add_dup_dest_folder_enhanced()
     
     def remove_dup_dest_folder(self):
-        """Remove selected destination folder."""
-        selection = self.dup_dest_listbox.curselection()
-        if selection:
-            index = selection[0]
-            self.dup_dest_listbox.delete(index)
-            del self.dup_dest_paths[index]
+        """Remove selected destination folder(s)."""
+        self.remove_dup_dest_folder_enhanced()
     
     def clear_dup_dest_folders(self):
         """Clear all destination folders."""
-        self.dup_dest_listbox.delete(0, tk.END)
-        self.dup_dest_paths.clear()
+        self.clear_dup_dest_folders_enhanced()
     
     def on_dup_hash_toggle(self):
         """Enable/disable hash algorithm selection for duplicates."""
         if self.dup_use_hash_var.get():
             self.dup_hash_combo.config(state="readonly")
+            self.dup_skip_unambiguous_check.config(state="normal")
+            self.dup_verify_check.config(state="disabled")
         else:
             self.dup_hash_combo.config(state="disabled")
+            self.dup_skip_unambiguous_check.config(state="disabled")
+            self.dup_verify_check.config(state="normal")
     
     def clear_duplicate_form(self):
         """Clear the duplicate detection form."""
@@ -1080,12 +1199,20 @@ class UniversalSearchApp:
             messagebox.showerror(t.get('error'), t.get('select_dest'))
             return
         
-        # Validate paths
-        if not self.dup_source_path.exists():
+        # Validate paths; stat them all at once, bounded by a timeout so a
+        # hung network mount can't freeze the UI
+        missing, unresponsive = find_missing_paths([self.dup_source_path] + self.dup_dest_paths,
+                                                   self.PATH_CHECK_TIMEOUT)
+        if unresponsive:
+            messagebox.showerror(t.get('error'), f"Folders not responding (network mount?):\n" +
+                            "\n".join(str(p) for p in unresponsive))
+            return
+        
+        if self.dup_source_path in missing:
             messagebox.showerror(t.get('error'), f"Source folder does not exist: {self.dup_source_path}")
             return
         
-        invalid_paths = [p for p in self.dup_dest_paths if not p.exists()]
+        invalid_paths = missing
         if invalid_paths:
             messagebox.showerror(t.get('error'), f"Invalid destination folders:\n" + 
                             "\n".join(str(p) for p in invalid_paths))
@@ -1107,7 +1234,9 @@ class UniversalSearchApp:
             use_hash=self.dup_use_hash_var.get(),
             hash_algo=self.dup_hash_algo_var.get(),
             reuse_indices=self.dup_reuse_indices_var.get(),
-            recreate_indices=len(indices_to_recreate) > 0 if hasattr(self, 'dup_dest_tree') else self.dup_recreate_indices_var.get()
+            recreate_indices=len(indices_to_recreate) > 0 if hasattr(self, 'dup_dest_tree') else self.dup_recreate_indices_var.get(),
+            skip_hash_when_unambiguous=self.dup_skip_unambiguous_var.get(),
+            verify_contents=self.dup_verify_var.get()
         )
         
         # Store which specific indices to recreate (for enhanced version)
@@ -1147,7 +1276,8 @@ class UniversalSearchApp:
         """Add new search location."""
         folder = filedialog.askdirectory(title=t.get('add_location'))
         if folder:
-            locations = self.config.get('index_search_locations', [])
+            # Copy so Config.set sees a changed value
+            locations = list(self.config.get('index_search_locations', []))
             if folder not in locations:
                 locations.append(folder)
                 self.config.set('index_search_locations', locations)
@@ -1158,7 +1288,7 @@ class UniversalSearchApp:
         selection = self.locations_listbox.curselection()
         if selection:
             index = selection[0]
-            locations = self.config.get('index_search_locations', [])
+            locations = list(self.config.get('index_search_locations', []))
             if 0 <= index < len(locations):
                 locations.pop(index)
                 self.config.set('index_search_locations', locations)
@@ -1202,29 +1332,34 @@ class UniversalSearchApp:
         self.root.destroy()
     
     def run_search_with_progress(self, criteria: SearchCriteria, active_indices: List[Path]):
-        """Run search with enhanced progress window and error recovery."""
+        """Run search with enhanced progress window and error recovery.
+
+        Each active index is loaded and searched on a worker pool so that
+        independent indices are processed concurrently; matches are posted
+        back to the Tk thread one batch per index.
+        """
         
         from threading import Thread
         import queue
         
         progress_window = ProgressWindow(self.root, "Searching Files")
-        search_results = []
         
         # Thread-safe communication queue
         progress_queue = queue.Queue()
         
         def update_progress_from_queue():
             """Safely updates GUI from main thread by checking the queue"""
+            latest_progress = None
             try:
                 while True:
                     message_type, operation, details, data = progress_queue.get_nowait()
                     if message_type == "progress":
-                        progress_window.update_operation(operation)
-                        progress_window.update_details(details)
-                    elif message_type == "result":
-                        # Add search result to tree with index name
-                        result, index_name = data
-                        self.add_search_result_to_tree(result, index_name)
+                        # Only the newest progress message is shown; earlier ones are stale
+                        latest_progress = (operation, details)
+                    elif message_type == "results":
+                        # Add a batch of search results to tree with index name
+                        results, index_name = data
+                        self.add_search_results_to_tree(results, index_name)
                     elif message_type == "error":
                         messagebox.showerror(t.get('error'), t.get('search_error', details))
                     elif message_type == "complete":
@@ -1235,18 +1370,18 @@ class UniversalSearchApp:
             except queue.Empty:
                 pass
             
-            # Reschedule this check if thread is still running
-            if search_thread_obj.is_alive():
+            if latest_progress:
+                progress_window.update_operation(latest_progress[0])
+                progress_window.update_details(latest_progress[1])
+            
+            # Reschedule this check if thread is still running or left messages behind
+            if search_thread_obj.is_alive() or not progress_queue.empty():
                 progress_window.root.after(50, update_progress_from_queue)  # More frequent updates
         
         def progress_callback(operation, details):
             """Thread-safe progress callback"""
             progress_queue.put(("progress", operation, details, None))
         
-        def result_callback(result, index_name):
-            """Thread-safe result callback with index name"""
-            progress_queue.put(("result", "", "", (result, index_name)))
-        
         def search_thread():
             """Background search thread with better error handling"""
             try:
@@ -1254,43 +1389,19 @@ class UniversalSearchApp:
                 
                 progress_callback("Initializing search", f"Preparing to search {len(active_indices)} active indices")
                 
-                for i, caf_path in enumerate(active_indices):
-                    if progress_window.cancelled.is_set():
-                        break
-                        
-                    if not caf_path.exists():
-                        progress_callback(f"Skipping index {i+1}/{len(active_indices)}", f"File not found: {caf_path.name}")
-                        continue
-                    
-                    # Extract index name
-                    try:
-                        index_name = caf_path.name
-                        if index_name.lower().endswith('.caf'):
-                            index_name = index_name[:-4]
-                        if '_index' in index_name:
-                            index_name = index_name.replace('_index', '')
-                    except:
-                        index_name = "Unknown"
-                    
-                    progress_callback(f"Loading index {i+1}/{len(active_indices)}", f"Reading: {caf_path.name}")
-                    
-                    # Load index with timeout protection
-                    file_index = self.load_index_for_search(caf_path)
-                    if not file_index:
-                        progress_callback(f"Skipping index {i+1}/{len(active_indices)}", f"Failed to load: {caf_path.name}")
-                        continue
-                    
-                    progress_callback(f"Searching index {i+1}/{len(active_indices)}", f"Loaded: {caf_path.name} ({file_index.total_files:,} files)")
-                    
-                    # Search in this index with progress
-                    results = self.search_files_in_index_with_progress(
-                        file_index, criteria, progress_callback, result_callback, 
-                        progress_window.cancelled, index_name
-                    )
-                    total_results += len(results)
-                    
-                    if progress_window.cancelled.is_set():
-                        break
+                max_workers = min(len(active_indices), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(self._search_one_index, caf_path, criteria,
+                                        progress_callback, progress_window.cancelled)
+                        for caf_path in active_indices
+                    ]
+                    # In index order, so results (and their CSV export) keep the same order every run
+                    for future in futures:
+                        index_name, results = future.result()
+                        if results and not progress_window.cancelled.is_set():
+                            progress_queue.put(("results", "", "", (results, index_name)))
+                        total_results += len(results)
                 
                 # Complete
                 progress_queue.put(("complete", "", "", total_results))
@@ -1313,30 +1424,49 @@ class UniversalSearchApp:
         # Wait for thread to complete
         search_thread_obj.join(timeout=1.0)
 
+    def _search_one_index(self, caf_path: Path, criteria: SearchCriteria, progress_callback, cancel_event):
+        """Load and search a single index. Runs on a worker thread, must not touch Tk."""
+        # Extract index name
+        try:
+            index_name = caf_path.name
+            if index_name.lower().endswith('.caf'):
+                index_name = index_name[:-4]
+            if '_index' in index_name:
+                index_name = index_name.replace('_index', '')
+        except:
+            index_name = "Unknown"
+        
+        if cancel_event.is_set():
+            return index_name, []
+        
+        if not caf_path.exists():
+            progress_callback("Skipping index", f"File not found: {caf_path.name}")
+            return index_name, []
+        
+        progress_callback("Loading index", f"Reading: {caf_path.name}")
+        
+        file_index = self.load_index_for_search(caf_path)
+        if not file_index:
+            progress_callback("Skipping index", f"Failed to load: {caf_path.name}")
+            return index_name, []
+        
+        progress_callback("Searching index", f"Loaded: {caf_path.name} ({file_index.total_files:,} files)")
+        
+        results = self.search_files_in_index_with_progress(
+            file_index, criteria, progress_callback, None, cancel_event, index_name
+        )
+        return index_name, results
+
     def search_files_in_index_with_progress(self, file_index, criteria, progress_callback, result_callback, cancel_event, index_name):
         """Search files in an index with optimized progress reporting."""
         results = []
         
-        # Compile regex pattern if provided
-        name_regex = None
-        if criteria.name_pattern:
-            try:
-                name_regex = re.compile(criteria.name_pattern, re.IGNORECASE)
-            except re.error as e:
-                raise ValueError(t.get('invalid_regex', e))
+        name_match = get_name_matcher(criteria)
+        mtime_min, mtime_max = get_mtime_bounds(criteria)
         
         # Pre-filter size buckets for better performance
-        relevant_sizes = []
-        total_entries = 0
-        
-        for size in file_index.size_index.keys():
-            # Size filtering at bucket level
-            if criteria.size_min is not None and size < criteria.size_min:
-                continue
-            if criteria.size_max is not None and size > criteria.size_max:
-                continue
-            relevant_sizes.append(size)
-            total_entries += len(file_index.size_index[size])
+        relevant_sizes = file_index.sizes_in_range(criteria.size_min, criteria.size_max)
+        total_entries = sum(len(file_index.size_index[size]) for size in relevant_sizes)
         
         if total_entries == 0:
             progress_callback("Search complete", f"No files match size criteria in {index_name}")
@@ -1347,40 +1477,18 @@ class UniversalSearchApp:
         processed = 0
         last_progress_update = 0
         
-        # Search through relevant size buckets only
+        # More frequent progress updates (every 500 files or 2% progress)
+        progress_threshold = min(500, max(100, total_entries // 50))
+        
+        # Search through relevant size buckets only, filtering each bucket in one pass
         for size in relevant_sizes:
             if cancel_event and cancel_event.is_set():
                 break
                 
             entries = file_index.size_index[size]
+            processed += len(entries)
             
-            for entry in entries:
-                if cancel_event and cancel_event.is_set():
-                    break
-                    
-                processed += 1
-                
-                # More frequent progress updates (every 500 files or 2% progress)
-                progress_threshold = min(500, max(100, total_entries // 50))
-                if processed - last_progress_update >= progress_threshold:
-                    progress_percentage = (processed / total_entries) * 100
-                    progress_callback(f"Searching {index_name}", 
-                                f"Processed {processed:,}/{total_entries:,} files ({progress_percentage:.1f}%) - {len(results)} matches")
-                    last_progress_update = processed
-                
-                # Name filtering
-                if name_regex and not name_regex.search(entry.path.name):
-                    continue
-                
-                # Date filtering  
-                if criteria.date_min or criteria.date_max:
-                    file_mtime = dt.fromtimestamp(entry.mtime)
-                    
-                    if criteria.date_min and file_mtime < criteria.date_min:
-                        continue
-                    if criteria.date_max and file_mtime > criteria.date_max:
-                        continue
-                
+            for entry in filter_entries(entries, name_match, mtime_min, mtime_max):
                 # File passed all criteria
                 result = SearchResult(
                     path=entry.path,
@@ -1389,7 +1497,14 @@ class UniversalSearchApp:
                     hash=entry.hash
                 )
                 results.append(result)
-                result_callback(result, index_name)
+                if result_callback:
+                    result_callback(result, index_name)
+            
+            if processed - last_progress_update >= progress_threshold:
+                progress_percentage = (processed / total_entries) * 100
+                progress_callback(f"Searching {index_name}", 
+                            f"Processed {processed:,}/{total_entries:,} files ({progress_percentage:.1f}%) - {len(results)} matches")
+                last_progress_update = processed
         
         # Final progress update
         if not cancel_event or not cancel_event.is_set():
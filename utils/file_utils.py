@@ -1,16 +1,47 @@
 # utils/file_utils.py
 
 """File operation utilities."""
+import os
 import hashlib
+import mmap
+import functools
 import re
 import sys
 import datetime
 import platform
+import threading
+import time
 from pathlib import Path, PureWindowsPath
 from datetime import datetime as dt
-from typing import Optional, List
+from typing import Callable, Iterator, Optional, List, Tuple
 from utils.platform_utils import get_platform_info
 
+try:
+    import blake3  # Optional: multithreaded, SIMD tree hashing for large files
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash  # Optional: faster non-cryptographic quick fingerprints
+except ImportError:
+    xxhash = None
+
+# Hash algorithms offered in the GUI and CLI; blake3 and xxh3 (128-bit, non-
+# cryptographic, for fast dedup) only if their packages are installed
+HASH_ALGORITHMS = (['md5', 'sha1', 'sha256'] + (['blake3'] if blake3 is not None else [])
+                   + (['xxh3'] if xxhash is not None else []))
+
+# Chunk size for hashing files that can't be memory-mapped; files up to this
+# size are hashed from a single read instead of a mapping
+HASH_CHUNK_SIZE = 1 << 20
+
+# Files at least this large are dropped from the page cache after hashing, so
+# one pass over a huge file doesn't evict everything else that was cached
+PAGE_CACHE_DROP_MIN = 64 << 20
+
+# Bytes read from each end of a file for quick_fingerprint
+FINGERPRINT_WINDOW = 64 * 1024
+
 def path_is_native_and_exists(path_obj: Path) -> bool:
     """
     Checks if a Path/PurePath object is compatible with the native OS and exists on disk.
@@ -36,8 +67,12 @@ def path_is_native_and_exists(path_obj: Path) -> bool:
         # Errors can occur if the path string is invalid on the current OS
         return False
 
+@functools.lru_cache(maxsize=4096)
 def format_size(size_bytes: int) -> str:
-    """Formats bytes into a human-readable string (KB, MB, GB)."""
+    """
+    Formats bytes into a human-readable string (KB, MB, GB).
+    Memoized: sizes repeat heavily in large indices (empty files, exact KiB).
+    """
     if size_bytes < 1024:
         return f"{size_bytes} B"
     size = float(size_bytes)
@@ -47,25 +82,214 @@ def format_size(size_bytes: int) -> str:
         size /= 1024.0
     return f"{size:.1f} PB"
 
+@functools.lru_cache(maxsize=1 << 16)
+def _format_minute(minute: int, fmt: str) -> str:
+    """Local-time text for the start of a Unix minute. UTC offsets are whole
+    minutes, so every timestamp within that minute shares this prefix."""
+    return time.strftime(fmt, time.localtime(minute * 60))
+
+def format_mtime(mtime: int) -> str:
+    """Format a Unix mtime as local 'YYYY-MM-DD HH:MM', memoized per minute."""
+    return _format_minute(int(mtime) // 60, '%Y-%m-%d %H:%M')
+
+def format_mtime_iso(mtime: int, sep: str = 'T') -> str:
+    """Format a Unix mtime as local 'YYYY-MM-DDTHH:MM:SS', memoized per minute."""
+    minute, second = divmod(int(mtime), 60)
+    return f"{_format_minute(minute, '%Y-%m-%d' + sep + '%H:%M')}:{second:02d}"
+
+# One untouched hash object per algorithm; copy() clones its state, which is
+# cheaper than hashlib.new() resolving the algorithm for every small file
+_HASH_PROTOTYPES = {}
+
+def _new_hash(hash_algo: str):
+    """Return a fresh hash object for hash_algo, cloned from a cached prototype."""
+    proto = _HASH_PROTOTYPES.get(hash_algo)
+    if proto is None:
+        if hash_algo == 'xxh3':
+            if xxhash is None:
+                raise ValueError("The 'xxh3' hash needs the optional xxhash package")
+            proto = xxhash.xxh3_128()
+        elif hash_algo == 'blake3':
+            if blake3 is None:
+                raise ValueError("The 'blake3' hash needs the optional blake3 package")
+            proto = blake3.blake3()
+        else:
+            proto = hashlib.new(hash_algo)
+        _HASH_PROTOTYPES[hash_algo] = proto
+    return proto.copy()
+
+# Threads blake3 may spread one large file over; pool workers that already run
+# one per core drop this to 1 through single_threaded_hashing
+_blake3_max_threads = blake3.blake3.AUTO if blake3 is not None else 1
+
+def single_threaded_hashing():
+    """Process pool initializer: hash each file on one thread, as the pool already fills every core."""
+    global _blake3_max_threads
+    _blake3_max_threads = 1
+
+def _fadvise(fd: int, advice: str):
+    """Give the kernel a whole-file access hint where posix_fadvise exists (not Windows/macOS)."""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
 def calculate_file_hash(file_path: Path, hash_algo: str) -> str:
     """Calculates the hash of a file."""
-    hash_obj = hashlib.new(hash_algo)
+    if hash_algo == 'blake3' and blake3 is not None:
+        try:
+            hasher = blake3.blake3(max_threads=_blake3_max_threads)
+            hasher.update_mmap(file_path)
+            return hasher.hexdigest()
+        except OSError as e:
+            print(f"Warning: Could not read file {file_path}: {e}", file=sys.stderr)
+            return ""
+    
+    hash_obj = _new_hash(hash_algo)
     try:
-        with file_path.open('rb') as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+        # Unbuffered: every read below is already one large syscall
+        with file_path.open('rb', buffering=0) as f:
+            fd = f.fileno()
+            file_size = os.fstat(fd).st_size
+            # Small files (the bulk of most trees) are read in one go; setting
+            # up and tearing down a mapping costs more than the copy
+            if file_size <= HASH_CHUNK_SIZE:
+                hash_obj.update(f.read())
+                return hash_obj.hexdigest()
+            _fadvise(fd, 'POSIX_FADV_SEQUENTIAL')  # Ask for aggressive read-ahead
+            try:
+                # Hand the whole mapped file to OpenSSL in one update() call, so the
+                # digest loop (SHA-NI where available) never returns to Python
+                try:
+                    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        hash_obj.update(mm)
+                    return hash_obj.hexdigest()
+                except (ValueError, OSError):
+                    pass  # A file system that can't be mapped
+                buffer = bytearray(HASH_CHUNK_SIZE)
+                view = memoryview(buffer)
+                while True:
+                    n = f.readinto(buffer)
+                    if not n:
+                        break
+                    hash_obj.update(view[:n])
+                return hash_obj.hexdigest()
+            finally:
+                if file_size >= PAGE_CACHE_DROP_MIN:
+                    _fadvise(fd, 'POSIX_FADV_DONTNEED')
     except OSError as e:
         print(f"Warning: Could not read file {file_path}: {e}", file=sys.stderr)
         return ""
 
+def files_equal(path_a: Path, path_b: Path) -> bool:
+    """
+    Byte-for-byte comparison of two files. Compares HASH_CHUNK_SIZE blocks with
+    bytes equality (a C memcmp), stopping at the first difference.
+    """
+    try:
+        if path_a.stat().st_size != path_b.stat().st_size:
+            return False
+        with path_a.open('rb') as fa, path_b.open('rb') as fb:
+            while True:
+                block_a = fa.read(HASH_CHUNK_SIZE)
+                if block_a != fb.read(HASH_CHUNK_SIZE):
+                    return False
+                if not block_a:
+                    return True
+    except OSError:
+        return False
+
+def find_missing_paths(paths: List[Path], timeout: float = 2.0,
+                       check: Callable[[Path], bool] = os.path.exists) -> Tuple[List[Path], List[Path]]:
+    """
+    Check many paths concurrently, one daemon thread per os.stat, so a hung
+    network mount can't block the caller for longer than timeout seconds.
+    Returns (missing, unresponsive): paths failing check (by default: that
+    don't exist), and paths whose check had not finished when the timeout expired.
+    """
+    exists = {}
+
+    def run_check(path):
+        exists[path] = check(path)
+
+    threads = [threading.Thread(target=run_check, args=(p,), daemon=True) for p in paths]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    missing = [p for p in paths if exists.get(p) is False]
+    unresponsive = [p for p in paths if p not in exists]
+    return missing, unresponsive
+
+def iter_file_entries(root: Path) -> Iterator[os.DirEntry]:
+    """
+    Yield an os.DirEntry for every file below root from a single os.scandir
+    walk, so callers can start work on the first files while the walk
+    continues. DirEntry caches the file type, so unlike rglob('*') +
+    is_file() this needs no extra stat per entry; on Windows entry.stat()
+    is served from the directory listing as well. Symlinked directories are
+    not descended into; unreadable directories are skipped.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def quick_fingerprint(file_path: Path, file_size: int) -> Optional[bytes]:
+    """
+    Cheap content fingerprint from the first and last FINGERPRINT_WINDOW bytes.
+    Files with different fingerprints can't be identical, so only files that
+    share one need a full cryptographic hash. Returns None if unreadable.
+    """
+    hasher = xxhash.xxh3_64() if xxhash is not None else hashlib.blake2b(digest_size=8)
+    try:
+        with file_path.open('rb') as f:
+            hasher.update(f.read(FINGERPRINT_WINDOW))
+            if file_size > FINGERPRINT_WINDOW:
+                f.seek(max(FINGERPRINT_WINDOW, file_size - FINGERPRINT_WINDOW))
+                hasher.update(f.read(FINGERPRINT_WINDOW))
+        return hasher.digest()
+    except OSError:
+        return None
+
+def hash_algo_from_index_name(caf_path: Path) -> str:
+    """Determine the hash algorithm an index was created with from its filename."""
+    name = caf_path.stem.lower()
+    if '_blake3' in name:
+        return 'blake3'
+    if '_xxh3' in name:
+        return 'xxh3'
+    if '_sha256' in name:
+        return 'sha256'
+    if '_sha1' in name:
+        return 'sha1'
+    return 'md5'
+
+# Size strings like '5MB', '2.5 GB', '100'; compiled once at import
+_SIZE_RE = re.compile(r'^([\d.]+)\s*([KMGT]?B?)$')
+_SIZE_MULT = {'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30, 'TB': 1 << 40}
+
 def parse_size(size_str: str) -> int:
     """Parse size string like '5MB', '2.5GB' to bytes."""
     if not size_str or size_str.lower() == 'any':
         return 0
     
     size_str = size_str.strip().upper()
-    match = re.match(r'^([\d.]+)\s*([KMGT]?B?)$', size_str)
+    match = _SIZE_RE.match(size_str)
     if not match:
         raise ValueError(f"Invalid size format: {size_str}")
     
@@ -75,35 +299,35 @@ def parse_size(size_str: str) -> int:
     if len(unit) == 1 and unit in "KMGT":
         unit += 'B'
     
-    multipliers = {'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3, 'TB': 1024**4}
-    return int(number * multipliers.get(unit, 1))
+    return int(number * _SIZE_MULT.get(unit, 1))
     
+# Relative date keywords (English and German) -> days before today
+_RELATIVE_DATES = {'today': 0, 'heute': 0, 'yesterday': 1, 'gestern': 1}
+
+# Candidate formats keyed by (first date separator, number of ':' in the time part)
+_DATE_FORMATS = {
+    ('-', 0): ('%Y-%m-%d',),
+    ('-', 1): ('%Y-%m-%d %H:%M',),
+    ('-', 2): ('%Y-%m-%d %H:%M:%S',),
+    ('.', 0): ('%d.%m.%Y',),
+    ('/', 0): ('%d/%m/%Y', '%m/%d/%Y'),
+}
+
 def parse_date(date_str: str) -> Optional[dt]:
     """Parse date string in various formats."""
     if not date_str or date_str.lower() in ['any', '']:
         return None
     
     # Handle relative dates in multiple languages
-    date_str_lower = date_str.lower()
-    now = dt.now()
-    
-    relative_dates = {
-        'today': now.replace(hour=0, minute=0, second=0, microsecond=0),
-        'heute': now.replace(hour=0, minute=0, second=0, microsecond=0),
-        'yesterday': (now - datetime.timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0),
-        'gestern': (now - datetime.timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0),
-    }
-    
-    if date_str_lower in relative_dates:
-        return relative_dates[date_str_lower]
-    
-    # Try various date formats
-    formats = [
-        '%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y', '%m/%d/%Y',
-        '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S',
-    ]
+    days_ago = _RELATIVE_DATES.get(date_str.lower())
+    if days_ago is not None:
+        today = dt.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - datetime.timedelta(days=days_ago)
     
-    for fmt in formats:
+    # Only try the formats that fit the separator and time part, so the common
+    # cases cost a single strptime instead of several failing ones
+    separator = next((c for c in date_str if c in '-./'), None)
+    for fmt in _DATE_FORMATS.get((separator, date_str.count(':')), ()):
         try:
             return dt.strptime(date_str, fmt)
         except ValueError:
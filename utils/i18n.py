@@ -70,6 +70,7 @@ class Translator:
                     'date_examples': ' (YYYY-MM-DD or \'today\', \'yesterday\')',
                     'search_button': 'Search Files',
                     'clear_button': 'Clear',
+                    'search_as_you_type': 'Search as you type',
                     'search_results': 'Search Results',
                     'filename_col': 'Filename',
                     'size_col': 'Size',
@@ -103,6 +104,8 @@ class Translator:
                     'clear_all': 'Clear All',
                     'options': 'Options',
                     'use_hash': 'Use file hashes for comparison',
+                    'skip_hash_unambiguous': 'Skip hashing unique name + size matches',
+                    'verify_contents': 'Verify matches byte by byte',
                     'reuse_indices': 'Reuse existing indices',
                     'force_recreation': 'Force recreation of indices',
                     'start_scan': 'Start Scan',
@@ -189,6 +192,7 @@ class Translator:
                     'date_examples': ' (JJJJ-MM-TT oder \'heute\', \'gestern\')',
                     'search_button': 'Dateien suchen',
                     'clear_button': 'Löschen',
+                    'search_as_you_type': 'Während der Eingabe suchen',
                     'search_results': 'Suchergebnisse',
                     'filename_col': 'Dateiname',
                     'size_col': 'Größe',
@@ -222,6 +226,8 @@ class Translator:
                     'clear_all': 'Alle löschen',
                     'options': 'Optionen',
                     'use_hash': 'Dateihashes für Vergleich verwenden',
+                    'skip_hash_unambiguous': 'Eindeutige Name + Größe-Treffer nicht hashen',
+                    'verify_contents': 'Treffer Byte für Byte prüfen',
                     'reuse_indices': 'Vorhandene Indices wiederverwenden',
                     'force_recreation': 'Neuerststellung der Indices erzwingen',
                     'start_scan': 'Scan starten',
@@ -303,15 +309,18 @@ class Translator:
         
         # Auto-detect system language with improved method
         self.current_lang = self._detect_system_language()
+        # Table for the current language, resolved once per language change
+        self._active = self.translations[self.current_lang]
     
     def set_language(self, lang_code: str):
         """Set the current language."""
         if lang_code in self.translations:
             self.current_lang = lang_code
+            self._active = self.translations[lang_code]
     
     def get(self, key: str, *args) -> str:
         """Get translated string, with optional formatting."""
-        text = self.translations[self.current_lang].get(key, key)
+        text = self._active.get(key, key)
         if args:
             try:
                 return text.format(*args)